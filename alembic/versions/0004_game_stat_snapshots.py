@@ -0,0 +1,31 @@
+"""per-game snapshots of derived batting/pitching counters
+
+Revision ID: 0004_game_stat_snapshots
+Revises: 0003_pa_client_event_composite
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_game_stat_snapshots"
+down_revision = "0003_pa_client_event_composite"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "game_stat_snapshots",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("game_id", sa.BigInteger(), sa.ForeignKey("games.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("through_pa_id", sa.BigInteger(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("batting", sa.JSON(), nullable=False),
+        sa.Column("pitching", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("game_id", "through_pa_id", name="uq_snapshot_game_seq"),
+    )
+    op.create_index("ix_game_stat_snapshots_game_id", "game_stat_snapshots", ["game_id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_game_stat_snapshots_game_id", table_name="game_stat_snapshots")
+    op.drop_table("game_stat_snapshots")
@@ -0,0 +1,63 @@
+"""batter/pitcher indexes on plate_appearances and matchup counter table
+
+Revision ID: 0005_matchup_counters
+Revises: 0004_game_stat_snapshots
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_matchup_counters"
+down_revision = "0004_game_stat_snapshots"
+branch_labels = None
+depends_on = None
+
+# counter column -> stored result labels (create_all stores member names, 0001 used values).
+# Frozen here: 0006 and 0010 load these helpers from this file rather than copying them.
+COUNTER_RESULTS = {
+    "singles": ("1B", "SINGLE"),
+    "doubles": ("2B", "DOUBLE"),
+    "triples": ("3B", "TRIPLE"),
+    "hr": ("HR", "HOMERUN"),
+    "bb": ("BB", "WALK"),
+    "hbp": ("HBP",),
+    "so": ("K", "STRIKEOUT"),
+    "sf": ("SF", "SAC_FLY"),
+    "other_outs": ("OUT",),
+}
+
+def counter_columns() -> list[sa.Column]:
+    return [sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in (*COUNTER_RESULTS, "rbi")]
+
+def counter_sums(prefix: str = "") -> str:
+    """SUM expressions for every counter column; ``prefix`` qualifies the PA columns, e.g. "pa."."""
+    sums = [
+        "SUM(CASE WHEN CAST({}result AS VARCHAR) IN ({}) THEN 1 ELSE 0 END)".format(prefix, ", ".join(f"'{v}'" for v in labels))
+        for labels in COUNTER_RESULTS.values()
+    ]
+    return ", ".join(sums + [f"SUM({prefix}rbis)"])
+
+def upgrade() -> None:
+    op.create_index("ix_pa_batter_pitcher", "plate_appearances", ["batter_id", "pitcher_id"])
+    op.create_index("ix_pa_pitcher_id", "plate_appearances", ["pitcher_id"])
+
+    op.create_table(
+        "matchup_counters",
+        sa.Column("batter_id", sa.BigInteger(), sa.ForeignKey("players.id"), primary_key=True),
+        sa.Column("pitcher_id", sa.BigInteger(), sa.ForeignKey("players.id"), primary_key=True),
+        *counter_columns(),
+    )
+    op.create_index("ix_matchup_counters_pitcher_id", "matchup_counters", ["pitcher_id"])
+
+    columns = ", ".join((*COUNTER_RESULTS, "rbi"))
+    op.execute(
+        f"INSERT INTO matchup_counters (batter_id, pitcher_id, {columns}) "
+        f"SELECT batter_id, pitcher_id, {counter_sums()} FROM plate_appearances "
+        "WHERE pitcher_id IS NOT NULL GROUP BY batter_id, pitcher_id"
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_matchup_counters_pitcher_id", table_name="matchup_counters")
+    op.drop_table("matchup_counters")
+    op.drop_index("ix_pa_pitcher_id", table_name="plate_appearances")
+    op.drop_index("ix_pa_batter_pitcher", table_name="plate_appearances")
@@ -0,0 +1,77 @@
+"""running game scores, team counters and team records
+
+Revision ID: 0006_team_aggregates
+Revises: 0005_matchup_counters
+Create Date: 2026-10-19
+"""
+from pathlib import Path
+from alembic import op
+from alembic.util import load_python_file
+import sqlalchemy as sa
+
+revision = "0006_team_aggregates"
+down_revision = "0005_matchup_counters"
+branch_labels = None
+depends_on = None
+
+# The counter helpers are frozen in 0005; load them from there so every migration agrees
+_counters = load_python_file(Path(__file__).parent, "0005_matchup_counters.py")
+COUNTER_RESULTS, counter_columns, counter_sums = _counters.COUNTER_RESULTS, _counters.counter_columns, _counters.counter_sums
+
+def upgrade() -> None:
+    op.add_column("games", sa.Column("home_score", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("games", sa.Column("away_score", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        "team_counters",
+        sa.Column("team_id", sa.BigInteger(), sa.ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("side", sa.String(length=8), primary_key=True),
+        *counter_columns(),
+    )
+    op.create_table(
+        "team_records",
+        sa.Column("team_id", sa.BigInteger(), sa.ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("season_id", sa.BigInteger(), sa.ForeignKey("seasons.id", ondelete="CASCADE"), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+          for name in ("wins", "losses", "ties", "runs_for", "runs_against")],
+    )
+    op.create_index("ix_team_records_season_id", "team_records", ["season_id"])
+
+    # Backfill from existing events; visitors bat in the top half
+    for side, top_team, bottom_team in (("batting", "away", "home"), ("pitching", "home", "away")):
+        op.execute(
+            f"INSERT INTO team_counters (team_id, side, {', '.join((*COUNTER_RESULTS, 'rbi'))}) "
+            f"SELECT CASE WHEN CAST(pa.half AS VARCHAR) = 'top' THEN g.{top_team}_team_id ELSE g.{bottom_team}_team_id END, "
+            f"'{side}', {counter_sums('pa.')} "
+            "FROM plate_appearances pa JOIN games g ON g.id = pa.game_id GROUP BY 1"
+        )
+    for column, half in (("away_score", "top"), ("home_score", "bottom")):
+        op.execute(
+            f"UPDATE games SET {column} = COALESCE((SELECT SUM(pa.rbis) FROM plate_appearances pa "
+            f"WHERE pa.game_id = games.id AND CAST(pa.half AS VARCHAR) = '{half}'), 0)"
+        )
+    op.execute(
+        "INSERT INTO team_records (team_id, season_id, wins, losses, ties, runs_for, runs_against) "
+        "SELECT team_id, season_id, SUM(w), SUM(l), SUM(t), SUM(rf), SUM(ra) FROM ("
+        "  SELECT home_team_id AS team_id, season_id,"
+        "    CASE WHEN home_score > away_score THEN 1 ELSE 0 END AS w,"
+        "    CASE WHEN home_score < away_score THEN 1 ELSE 0 END AS l,"
+        "    CASE WHEN home_score = away_score THEN 1 ELSE 0 END AS t,"
+        "    home_score AS rf, away_score AS ra"
+        "  FROM games WHERE CAST(status AS VARCHAR) = 'final'"
+        "  UNION ALL"
+        "  SELECT away_team_id, season_id,"
+        "    CASE WHEN away_score > home_score THEN 1 ELSE 0 END,"
+        "    CASE WHEN away_score < home_score THEN 1 ELSE 0 END,"
+        "    CASE WHEN away_score = home_score THEN 1 ELSE 0 END,"
+        "    away_score, home_score"
+        "  FROM games WHERE CAST(status AS VARCHAR) = 'final'"
+        ") results GROUP BY team_id, season_id"
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_team_records_season_id", table_name="team_records")
+    op.drop_table("team_records")
+    op.drop_table("team_counters")
+    op.drop_column("games", "away_score")
+    op.drop_column("games", "home_score")
@@ -0,0 +1,36 @@
+"""game version and PA correction audit trail
+
+Revision ID: 0007_pa_corrections
+Revises: 0006_team_aggregates
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_pa_corrections"
+down_revision = "0006_team_aggregates"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("games", sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+    op.create_table(
+        "pa_corrections",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("pa_id", sa.BigInteger(), nullable=False),
+        sa.Column("game_id", sa.BigInteger(), sa.ForeignKey("games.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("action", sa.String(length=10), nullable=False),
+        sa.Column("before", sa.JSON(), nullable=False),
+        sa.Column("after", sa.JSON(), nullable=True),
+        sa.Column("reason", sa.String(length=250), nullable=True),
+        sa.Column("game_version", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_pa_corrections_pa_id", "pa_corrections", ["pa_id"])
+    op.create_index("ix_pa_corrections_game_id", "pa_corrections", ["game_id"])
+
+def downgrade():
+    op.drop_index("ix_pa_corrections_game_id", table_name="pa_corrections")
+    op.drop_index("ix_pa_corrections_pa_id", table_name="pa_corrections")
+    op.drop_table("pa_corrections")
+    op.drop_column("games", "version")
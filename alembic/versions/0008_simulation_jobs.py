@@ -0,0 +1,30 @@
+"""simulation jobs
+
+Revision ID: 0008_simulation_jobs
+Revises: 0007_pa_corrections
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_simulation_jobs"
+down_revision = "0007_pa_corrections"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "simulation_jobs",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("target_id", sa.BigInteger(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=10), nullable=False, server_default="queued"),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+
+def downgrade():
+    op.drop_table("simulation_jobs")
@@ -0,0 +1,31 @@
+"""versioned lineups
+
+Revision ID: 0009_lineup_versions
+Revises: 0008_simulation_jobs
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_lineup_versions"
+down_revision = "0008_simulation_jobs"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("lineups", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column("lineups", sa.Column("created_at", sa.DateTime(), nullable=True, server_default=sa.func.now()))
+    op.drop_constraint("uq_lineup_order", "lineups", type_="unique")
+    op.create_unique_constraint("uq_lineup_order", "lineups", ["game_id", "team_id", "version", "batting_order"])
+
+def downgrade():
+    # Keep only each team's current lineup so the old constraint holds
+    op.execute("""
+        DELETE FROM lineups l
+        USING (SELECT game_id, team_id, MAX(version) AS version FROM lineups GROUP BY game_id, team_id) cur
+        WHERE l.game_id = cur.game_id AND l.team_id = cur.team_id AND l.version < cur.version
+    """)
+    op.drop_constraint("uq_lineup_order", "lineups", type_="unique")
+    op.create_unique_constraint("uq_lineup_order", "lineups", ["game_id", "team_id", "batting_order"])
+    op.drop_column("lineups", "created_at")
+    op.drop_column("lineups", "version")
@@ -0,0 +1,59 @@
+"""people and per-season player rollups
+
+Revision ID: 0010_people_and_rollups
+Revises: 0009_lineup_versions
+Create Date: 2026-10-19
+"""
+from pathlib import Path
+from alembic import op
+from alembic.util import load_python_file
+import sqlalchemy as sa
+
+revision = "0010_people_and_rollups"
+down_revision = "0009_lineup_versions"
+branch_labels = None
+depends_on = None
+
+# The counter helpers are frozen in 0005; load them from there so every migration agrees
+_counters = load_python_file(Path(__file__).parent, "0005_matchup_counters.py")
+COUNTER_RESULTS, counter_columns, counter_sums = _counters.COUNTER_RESULTS, _counters.counter_columns, _counters.counter_sums
+
+def upgrade() -> None:
+    op.create_table(
+        "people",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("first_name", sa.String(length=80), nullable=False),
+        sa.Column("last_name", sa.String(length=80), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_people_last_name", "people", ["last_name"])
+    op.add_column("players", sa.Column("person_id", sa.BigInteger(), nullable=True))
+    op.create_foreign_key("fk_players_person_id", "players", "people", ["person_id"], ["id"], ondelete="SET NULL")
+    op.create_index("ix_players_person_id", "players", ["person_id"])
+
+    op.create_table(
+        "player_season_rollups",
+        sa.Column("player_id", sa.BigInteger(), sa.ForeignKey("players.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("side", sa.String(length=8), primary_key=True),
+        sa.Column("season_id", sa.BigInteger(), sa.ForeignKey("seasons.id", ondelete="CASCADE"), nullable=False),
+        *counter_columns(),
+    )
+    op.create_index("ix_player_season_rollups_season_id", "player_season_rollups", ["season_id"])
+
+    # Backfill from the events still in the database (archived-and-deleted seasons can't be)
+    for side, column in (("batting", "batter_id"), ("pitching", "pitcher_id")):
+        op.execute(
+            f"INSERT INTO player_season_rollups (player_id, side, season_id, {', '.join((*COUNTER_RESULTS, 'rbi'))}) "
+            f"SELECT pa.{column}, '{side}', MIN(g.season_id), {counter_sums('pa.')} "
+            f"FROM plate_appearances pa JOIN games g ON g.id = pa.game_id "
+            f"WHERE pa.{column} IS NOT NULL GROUP BY pa.{column}"
+        )
+
+def downgrade() -> None:
+    op.drop_index("ix_player_season_rollups_season_id", table_name="player_season_rollups")
+    op.drop_table("player_season_rollups")
+    op.drop_index("ix_players_person_id", table_name="players")
+    op.drop_constraint("fk_players_person_id", "players", type_="foreignkey")
+    op.drop_column("players", "person_id")
+    op.drop_index("ix_people_last_name", table_name="people")
+    op.drop_table("people")
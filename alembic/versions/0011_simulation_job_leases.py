@@ -0,0 +1,23 @@
+"""simulation job owners and heartbeat leases
+
+Revision ID: 0011_simulation_job_leases
+Revises: 0010_people_and_rollups
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_simulation_job_leases"
+down_revision = "0010_people_and_rollups"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("simulation_jobs", sa.Column("owner", sa.String(length=100), nullable=True))
+    op.add_column("simulation_jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_simulation_jobs_status", "simulation_jobs", ["status"])
+
+def downgrade():
+    op.drop_index("ix_simulation_jobs_status", table_name="simulation_jobs")
+    op.drop_column("simulation_jobs", "heartbeat_at")
+    op.drop_column("simulation_jobs", "owner")
@@ -0,0 +1,89 @@
+"""Maintenance commands.
+
+    python -m app.cli archive-season 3 --delete
+    python -m app.cli verify-snapshots 42
+    python -m app.cli rebuild-snapshots 42 --from-seq 1200
+"""
+from __future__ import annotations
+import argparse
+from .db import SessionLocal
+from . import models
+from .services.archive import export_season
+from .services.snapshots import rebuild_snapshots, verify_snapshot
+from .services.notify import publish_invalidation
+
+def archive_season(args) -> int:
+    db = SessionLocal()
+    try:
+        if not db.get(models.Season, args.season_id):
+            print(f"Season {args.season_id} not found")
+            return 1
+        try:
+            path = export_season(db, args.season_id, delete=args.delete, force=args.force)
+        except ValueError as e:
+            print(e)
+            return 1
+        publish_invalidation(db, season_ids=[args.season_id])
+        db.commit()
+        print(f"Archived season {args.season_id} to {path}" + (" and deleted its rows" if args.delete else ""))
+        return 0
+    finally:
+        db.close()
+
+def _report(report: dict) -> int:
+    if report["ok"]:
+        print(f"Game {report['game_id']}: snapshots match a full replay (latest through PA {report['snapshot_seq']})")
+        return 0
+    print(f"Game {report['game_id']}: snapshot through PA {report['snapshot_seq']} disagrees with a full replay "
+          f"(batters {report['batting_mismatches']}, pitchers {report['pitching_mismatches']})")
+    return 1
+
+def verify_snapshots(args) -> int:
+    db = SessionLocal()
+    try:
+        if not db.get(models.Game, args.game_id):
+            print(f"Game {args.game_id} not found")
+            return 1
+        return _report(verify_snapshot(db, args.game_id))
+    finally:
+        db.close()
+
+def rebuild_game_snapshots(args) -> int:
+    db = SessionLocal()
+    try:
+        if not db.get(models.Game, args.game_id):
+            print(f"Game {args.game_id} not found")
+            return 1
+        written = rebuild_snapshots(db, args.game_id, from_seq=args.from_seq)
+        publish_invalidation(db, game_ids=[args.game_id])
+        db.commit()
+        print(f"Game {args.game_id}: wrote {written} snapshots")
+        return _report(verify_snapshot(db, args.game_id))
+    finally:
+        db.close()
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("archive-season", help="Export a finished season to memory-mappable columnar files")
+    p.add_argument("season_id", type=int)
+    p.add_argument("--delete", action="store_true", help="Delete the season's PAs, corrections, lineups and games afterwards")
+    p.add_argument("--force", action="store_true", help="Overwrite an existing archive (only while the season's rows are still in the database)")
+    p.set_defaults(func=archive_season)
+
+    p = sub.add_parser("verify-snapshots", help="Check a game's counter snapshots against a full replay")
+    p.add_argument("game_id", type=int)
+    p.set_defaults(func=verify_snapshots)
+
+    p = sub.add_parser("rebuild-snapshots", help="Re-take a game's counter snapshots from its events")
+    p.add_argument("game_id", type=int)
+    p.add_argument("--from-seq", type=int, default=0,
+                   help="Only replace snapshots covering this PA id and later (default: all)")
+    p.set_defaults(func=rebuild_game_snapshots)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
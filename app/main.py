@@ -1,8 +1,28 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from .routers import seasons, teams, players, games, plate_appearances
-from .db import Base, engine
+from .routers import seasons, teams, players, games, plate_appearances, matchups, simulations, people
+from .db import Base, SessionLocal, engine
+from .services.notify import CacheListener
+from .services import jobs
 
-app = FastAPI(title="Baseball Scorecard API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Simulation jobs run in-process: keep this process's leases alive and fail jobs of dead ones
+    leases = jobs.LeaseKeeper(SessionLocal)
+    leases.start()
+    # Keep this worker's stats cache coherent with writes taken by other workers
+    listener = None
+    if engine.dialect.name == "postgresql" and os.getenv("STATS_LISTENER", "1") == "1":
+        listener = CacheListener(engine.url)
+        listener.start()
+    yield
+    if listener is not None:
+        listener.stop()
+    leases.stop()
+    jobs.shutdown()
+
+app = FastAPI(title="Baseball Scorecard API", version="0.1.0", lifespan=lifespan)
 
 @app.get("/healthz")
 def healthz():
@@ -13,3 +33,6 @@ app.include_router(teams.router)
 app.include_router(players.router)
 app.include_router(games.router)
 app.include_router(plate_appearances.router)
+app.include_router(matchups.router)
+app.include_router(simulations.router)
+app.include_router(people.router)
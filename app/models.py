@@ -1,12 +1,15 @@
 from __future__ import annotations
 from datetime import datetime
 from sqlalchemy import (
-    BigInteger, Integer, String, DateTime, ForeignKey, Enum, UniqueConstraint, CheckConstraint
+    BigInteger, Integer, String, DateTime, ForeignKey, Enum, UniqueConstraint, CheckConstraint, JSON, Index
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .db import Base
 import enum
 
+# SQLite only autoincrements INTEGER PRIMARY KEY columns (used by the test suite)
+BigIntPK = BigInteger().with_variant(Integer, "sqlite")
+
 class GameStatus(enum.Enum):
     live = "live"
     final = "final"
@@ -26,9 +29,22 @@ class PAResult(enum.Enum):
     SAC_FLY = "SF"
     OUT = "OUT"
 
+class ResultCounters:
+    """One column per PA outcome plus RBIs, matching services.counters.COUNTER_FIELDS."""
+    singles: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    doubles: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    triples: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    hr: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    bb: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    hbp: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    so: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    sf: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    other_outs: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    rbi: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
 class Season(Base):
     __tablename__ = "seasons"
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
     name: Mapped[str] = mapped_column(String(100))
     year: Mapped[int] = mapped_column(Integer, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -38,31 +54,48 @@ class Season(Base):
 
 class Team(Base):
     __tablename__ = "teams"
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
     season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id", ondelete="CASCADE"), index=True)
     name: Mapped[str] = mapped_column(String(120), index=True)
 
     season: Mapped["Season"] = relationship(back_populates="teams")
     players: Mapped[list["Player"]] = relationship(back_populates="team", cascade="all, delete-orphan")
 
+class Person(Base):
+    """The real person behind season-scoped Player rows."""
+    __tablename__ = "people"
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
+    first_name: Mapped[str] = mapped_column(String(80))
+    last_name: Mapped[str] = mapped_column(String(80), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    players: Mapped[list["Player"]] = relationship(back_populates="person")
+
 class Player(Base):
     __tablename__ = "players"
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
     team_id: Mapped[int] = mapped_column(ForeignKey("teams.id", ondelete="CASCADE"), index=True)
+    person_id: Mapped[int | None] = mapped_column(ForeignKey("people.id", ondelete="SET NULL"), nullable=True, index=True)
     first_name: Mapped[str] = mapped_column(String(80))
     last_name: Mapped[str] = mapped_column(String(80))
     handedness: Mapped[str | None] = mapped_column(String(2), nullable=True)  # e.g., R/L/S
 
     team: Mapped["Team"] = relationship(back_populates="players")
+    person: Mapped["Person | None"] = relationship(back_populates="players")
 
 class Game(Base):
     __tablename__ = "games"
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
     season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id", ondelete="CASCADE"), index=True)
     home_team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"))
     away_team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"))
     start_time: Mapped[datetime | None] = mapped_column(DateTime, default=datetime.utcnow)
     status: Mapped[GameStatus] = mapped_column(Enum(GameStatus), default=GameStatus.live)
+    # Running score (RBIs proxy), kept current by every PA write
+    home_score: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    away_score: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Bumped on every PA write or correction so clients know to refresh
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     season: Mapped["Season"] = relationship(back_populates="games")
     home_team: Mapped["Team"] = relationship(foreign_keys=[home_team_id])
@@ -72,15 +105,18 @@ class Game(Base):
 
 class Lineup(Base):
     __tablename__ = "lineups"
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), index=True)
     team_id: Mapped[int] = mapped_column(ForeignKey("teams.id", ondelete="CASCADE"), index=True)
     batting_order: Mapped[int] = mapped_column(Integer)  # 1..9
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"))
     defensive_position: Mapped[str | None] = mapped_column(String(3), nullable=True)
+    # Each write adds a new version per team; the highest one is the current lineup
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
-        UniqueConstraint("game_id", "team_id", "batting_order", name="uq_lineup_order"),
+        UniqueConstraint("game_id", "team_id", "version", "batting_order", name="uq_lineup_order"),
         CheckConstraint("batting_order BETWEEN 1 AND 9", name="ck_batting_order_range"),
     )
 
@@ -89,7 +125,7 @@ class Lineup(Base):
 
 class PlateAppearance(Base):
     __tablename__ = "plate_appearances"
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), index=True)
     inning: Mapped[int] = mapped_column(Integer)  # 1..N
     half: Mapped[HalfInning] = mapped_column(Enum(HalfInning))
@@ -104,6 +140,81 @@ class PlateAppearance(Base):
 
     __table_args__ = (
         UniqueConstraint("game_id", "client_event_id", name="uq_pa_game_client_event"),
+        Index("ix_pa_batter_pitcher", "batter_id", "pitcher_id"),
+        Index("ix_pa_pitcher_id", "pitcher_id"),
     )
 
     game: Mapped["Game"] = relationship(back_populates="plate_appearances")
+
+class GameStatSnapshot(Base):
+    __tablename__ = "game_stat_snapshots"
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), index=True)
+    through_pa_id: Mapped[int] = mapped_column(BigInteger)  # highest PA id folded into the counters
+    event_count: Mapped[int] = mapped_column(Integer)
+    batting: Mapped[dict] = mapped_column(JSON)   # {batter_id: counters}
+    pitching: Mapped[dict] = mapped_column(JSON)  # {pitcher_id: counters}
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("game_id", "through_pa_id", name="uq_snapshot_game_seq"),
+    )
+
+class MatchupCounter(ResultCounters, Base):
+    """Batter-vs-pitcher totals per pair of season players, kept current by every PA write."""
+    __tablename__ = "matchup_counters"
+    batter_id: Mapped[int] = mapped_column(ForeignKey("players.id"), primary_key=True)
+    pitcher_id: Mapped[int] = mapped_column(ForeignKey("players.id"), primary_key=True, index=True)
+
+class TeamCounter(ResultCounters, Base):
+    """Team batting ("batting") and opponents' batting ("pitching") totals for a season team."""
+    __tablename__ = "team_counters"
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    side: Mapped[str] = mapped_column(String(8), primary_key=True)
+
+class PlayerSeasonRollup(ResultCounters, Base):
+    """A player's season batting ("batting") or pitching ("pitching") totals; summed for careers."""
+    __tablename__ = "player_season_rollups"
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    side: Mapped[str] = mapped_column(String(8), primary_key=True)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id", ondelete="CASCADE"), index=True)
+
+class TeamRecord(Base):
+    """W-L and runs over final games, updated when a game is finalized (or reopened)."""
+    __tablename__ = "team_records"
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id", ondelete="CASCADE"), index=True)
+    wins: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    losses: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    ties: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    runs_for: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    runs_against: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+class PACorrection(Base):
+    """Audit trail for edits and deletions of recorded plate appearances."""
+    __tablename__ = "pa_corrections"
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
+    pa_id: Mapped[int] = mapped_column(BigInteger, index=True)  # no FK: the PA may be gone
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), index=True)
+    action: Mapped[str] = mapped_column(String(10))  # "update" | "delete"
+    before: Mapped[dict] = mapped_column(JSON)
+    after: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    reason: Mapped[str | None] = mapped_column(String(250), nullable=True)
+    game_version: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class SimulationJob(Base):
+    """A Monte Carlo run requested over the API; the result is stored when it finishes."""
+    __tablename__ = "simulation_jobs"
+    id: Mapped[int] = mapped_column(BigIntPK, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))  # "season" | "game"
+    target_id: Mapped[int] = mapped_column(BigInteger)  # season or game id
+    params: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[str] = mapped_column(String(10), default="queued", index=True)  # queued | running | done | failed
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # The API process running the job renews heartbeat_at; an expired lease means it died
+    owner: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
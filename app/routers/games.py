@@ -1,8 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from ..db import get_db
 from .. import models, schemas
-from ..services.stats import compute_boxscore, compute_game_pitching
+from ..services.stats import compute_game_pitching
+from ..services.cache import stats_cache
+from ..services.notify import publish_invalidation
+from ..services.aggregates import apply_game_result
+from ..services.archive import is_archived
+from ..services.lineup_optimizer import optimize, player_transitions
+from ..services.lineups import latest_versions, read_lineup
 
 router = APIRouter(prefix="/games", tags=["games"])
 
@@ -17,33 +27,132 @@ def create_game(payload: schemas.GameCreate, db: Session = Depends(get_db)):
     db.refresh(game)
     return game
 
+@router.get("/{game_id}", response_model=schemas.GameOut)
+def get_game(game_id: int, db: Session = Depends(get_db)):
+    game = db.get(models.Game, game_id)
+    if not game:
+        raise HTTPException(404, "Game not found")
+    return game
+
+@router.get("/{game_id}/corrections", response_model=list[schemas.PACorrectionOut])
+def list_corrections(game_id: int, db: Session = Depends(get_db)):
+    if not db.get(models.Game, game_id):
+        raise HTTPException(404, "Game not found")
+    return (
+        db.query(models.PACorrection)
+          .filter(models.PACorrection.game_id == game_id)
+          .order_by(models.PACorrection.id)
+          .all()
+    )
+
 @router.post("/{game_id}/lineup")
 def set_lineup(game_id: int, body: schemas.LineupSet, db: Session = Depends(get_db)):
+    """Store a new lineup version for each team in the body; earlier versions are kept."""
     game = db.get(models.Game, game_id)
     if not game:
         raise HTTPException(404, "Game not found")
 
-    # Clear existing lineup for this game
-    db.query(models.Lineup).filter(models.Lineup.game_id == game_id).delete()
-
-    # Validate batting orders are 1..9 and unique per team
-    seen = {}
+    # Validate batting orders are 1..9 and unique per team, and players unique per team
+    seen_orders, seen_players = set(), set()
     for entry in body.entries:
-        key = (entry.team_id, entry.batting_order)
-        if key in seen:
+        if entry.team_id not in (game.home_team_id, game.away_team_id):
+            raise HTTPException(400, f"Team {entry.team_id} is not playing in this game")
+        if (entry.team_id, entry.batting_order) in seen_orders:
             raise HTTPException(400, f"Duplicate batting order {entry.batting_order} for team {entry.team_id}")
-        seen[key] = True
-        if not db.get(models.Player, entry.player_id):
+        if (entry.team_id, entry.player_id) in seen_players:
+            raise HTTPException(400, f"Player {entry.player_id} appears twice for team {entry.team_id}")
+        seen_orders.add((entry.team_id, entry.batting_order))
+        seen_players.add((entry.team_id, entry.player_id))
+
+    # One query for every player's team
+    player_ids = {e.player_id for e in body.entries}
+    teams = dict(
+        db.query(models.Player.id, models.Player.team_id).filter(models.Player.id.in_(player_ids)).all()
+    ) if player_ids else {}
+    for entry in body.entries:
+        if entry.player_id not in teams:
             raise HTTPException(404, f"Player {entry.player_id} not found")
-        db.add(models.Lineup(
-            game_id=game_id,
-            team_id=entry.team_id,
-            batting_order=entry.batting_order,
-            player_id=entry.player_id,
-            defensive_position=entry.defensive_position
-        ))
-    db.commit()
-    return {"ok": True}
+        if teams[entry.player_id] != entry.team_id:
+            raise HTTPException(400, f"Player {entry.player_id} is not on team {entry.team_id}")
+
+    current = latest_versions(db, game_id)
+    versions = {t: current.get(t, 0) + 1 for t in {e.team_id for e in body.entries}}
+    if body.entries:
+        db.execute(insert(models.Lineup), [
+            {
+                "game_id": game_id,
+                "team_id": entry.team_id,
+                "version": versions[entry.team_id],
+                "batting_order": entry.batting_order,
+                "player_id": entry.player_id,
+                "defensive_position": entry.defensive_position,
+                "created_at": datetime.utcnow(),
+            }
+            for entry in body.entries
+        ])
+    publish_invalidation(db, game_ids=[game_id])
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(409, "Lineup was changed concurrently; retry")
+    return {"ok": True, "versions": versions}
+
+@router.get("/{game_id}/lineup", response_model=schemas.GameLineup)
+def get_lineup(game_id: int, version: Optional[int] = Query(None, ge=1, description="Lineup version (default: current); needs team_id"),
+               team_id: Optional[int] = Query(None, description="Only this team's lineup"),
+               db: Session = Depends(get_db)):
+    game = db.get(models.Game, game_id)
+    if not game:
+        raise HTTPException(404, "Game not found")
+    if team_id is not None and team_id not in (game.home_team_id, game.away_team_id):
+        raise HTTPException(400, f"Team {team_id} is not playing in this game")
+    if version is not None and team_id is None:
+        raise HTTPException(400, "Lineup versions are per team; pass team_id with version")
+    return read_lineup(db, game_id, version, team_id)
+
+@router.post("/{game_id}/lineup/optimize", response_model=schemas.LineupOptimization)
+def optimize_lineup(game_id: int, body: schemas.LineupOptimizeRequest, db: Session = Depends(get_db)):
+    game = db.get(models.Game, game_id)
+    if not game:
+        raise HTTPException(404, "Game not found")
+    if len(set(body.player_ids)) != 9:
+        raise HTTPException(400, "Nine distinct players required")
+    teams = dict(db.query(models.Player.id, models.Player.team_id).filter(models.Player.id.in_(body.player_ids)).all())
+    missing = [pid for pid in body.player_ids if pid not in teams]
+    if missing:
+        raise HTTPException(404, f"Players not found: {missing}")
+    team_ids = set(teams.values())
+    if len(team_ids) != 1 or not team_ids <= {game.home_team_id, game.away_team_id}:
+        raise HTTPException(400, "Players must all be on one of the game's teams")
+
+    chains = player_transitions(db, game.season_id, body.player_ids)
+    result = optimize(chains, body.player_ids, top=body.top, seed=body.seed)
+    score = lambda order, runs: schemas.OrderScore(player_ids=order, expected_runs=round(runs, 4))
+    return schemas.LineupOptimization(
+        game_id=game_id,
+        team_id=team_ids.pop(),
+        current=score(*result.current),
+        best=[score(*r) for r in result.best],
+        evaluated=result.evaluated,
+        exhaustive=result.exhaustive,
+    )
+
+@router.patch("/{game_id}/status", response_model=schemas.GameOut)
+def set_status(game_id: int, body: schemas.GameStatusUpdate, db: Session = Depends(get_db)):
+    game = db.get(models.Game, game_id)
+    if not game:
+        raise HTTPException(404, "Game not found")
+    if game.status != body.status and is_archived(game.season_id):
+        raise HTTPException(409, "Season is archived")
+    if game.status != body.status:
+        # Finalizing counts the result in both teams' records; reopening takes it back out
+        apply_game_result(db, game, sign=1 if body.status == models.GameStatus.final else -1)
+        game.status = body.status
+        publish_invalidation(db, game_ids=[game_id], season_ids=[game.season_id])
+        db.commit()
+        db.refresh(game)
+    return game
 
 
 @router.get("/{game_id}/pitching", response_model=schemas.GamePitching)
@@ -51,4 +160,7 @@ def game_pitching(game_id: int, db: Session = Depends(get_db)):
     game = db.get(models.Game, game_id)
     if not game:
         raise HTTPException(404, "Game not found")
-    return compute_game_pitching(db, game_id)
\ No newline at end of file
+    return stats_cache.get_or_compute(
+        "game", game_id, "pitching",
+        lambda: compute_game_pitching(db, game_id).model_copy(update={"version": game.version}),
+    )
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..db import get_db
+from .. import models, schemas
+from ..services.stats import compute_matchup, compute_pitcher_matchups
+
+router = APIRouter(prefix="/matchups", tags=["matchups"])
+
+@router.get("", response_model=schemas.MatchupStats)
+def matchup(
+    batter_id: int = Query(..., description="Batter player id"),
+    pitcher_id: int = Query(..., description="Pitcher player id"),
+    db: Session = Depends(get_db),
+):
+    line = compute_matchup(db, batter_id, pitcher_id)
+    if line is None:
+        raise HTTPException(404, "Batter or pitcher not found")
+    return line
+
+@router.get("/pitchers/{pitcher_id}", response_model=list[schemas.MatchupStats])
+def pitcher_top_matchups(
+    pitcher_id: int,
+    sort: str = Query("pa", pattern="^(pa|ops|avg|hr|so)$", description="Rank batters by this stat"),
+    min_pa: int = Query(1, ge=1, description="Minimum plate appearances against the pitcher"),
+    limit: int = Query(10, ge=1, le=100, description="Max batters to return"),
+    db: Session = Depends(get_db),
+):
+    if not db.get(models.Player, pitcher_id):
+        raise HTTPException(404, "Pitcher not found")
+    return compute_pitcher_matchups(db, pitcher_id, sort=sort, min_pa=min_pa, limit=limit)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from ..db import get_db
+from .. import models, schemas
+from ..services.stats import compute_career, compute_career_matchup
+
+router = APIRouter(prefix="/people", tags=["people"])
+
+def _person_out(db: Session, person: models.Person) -> schemas.PersonOut:
+    ids = [pid for (pid,) in db.query(models.Player.id).filter(models.Player.person_id == person.id).order_by(models.Player.id)]
+    return schemas.PersonOut(id=person.id, first_name=person.first_name, last_name=person.last_name, player_ids=ids)
+
+@router.post("", response_model=schemas.PersonOut)
+def create_person(payload: schemas.PersonCreate, db: Session = Depends(get_db)):
+    person = models.Person(**payload.dict())
+    db.add(person)
+    db.commit()
+    db.refresh(person)
+    return _person_out(db, person)
+
+@router.get("/{person_id}", response_model=schemas.PersonOut)
+def get_person(person_id: int, db: Session = Depends(get_db)):
+    person = db.get(models.Person, person_id)
+    if not person:
+        raise HTTPException(404, "Person not found")
+    return _person_out(db, person)
+
+@router.get("/{person_id}/career", response_model=schemas.Career)
+def career(person_id: int, db: Session = Depends(get_db)):
+    person = db.get(models.Person, person_id)
+    if not person:
+        raise HTTPException(404, "Person not found")
+    return compute_career(db, person)
+
+@router.get("/{person_id}/matchups/{pitcher_person_id}", response_model=schemas.CareerMatchup)
+def career_matchup(person_id: int, pitcher_person_id: int, db: Session = Depends(get_db)):
+    batter, pitcher = db.get(models.Person, person_id), db.get(models.Person, pitcher_person_id)
+    if not batter or not pitcher:
+        raise HTTPException(404, "Person not found")
+    return compute_career_matchup(db, batter, pitcher)
@@ -4,13 +4,22 @@ from sqlalchemy.exc import IntegrityError
 from ..db import get_db
 from .. import models, schemas
 from ..services.stats import compute_boxscore
+from ..services.snapshots import maybe_snapshot
+from ..services.cache import stats_cache
+from ..services.notify import publish_invalidation
+from ..services.aggregates import apply_game_result, apply_pa, bump_game_version
+from ..services.archive import is_archived
+from ..services.corrections import correct_pa, delete_pa
 
 router = APIRouter(prefix="/pa", tags=["plate_appearances"])
 
 @router.post("", response_model=schemas.PAOut)
 def add_pa(payload: schemas.PACreate, db: Session = Depends(get_db)):
-    if not db.get(models.Game, payload.game_id):
+    game = db.get(models.Game, payload.game_id)
+    if not game:
         raise HTTPException(404, "Game not found")
+    if is_archived(game.season_id):
+        raise HTTPException(409, "Season is archived")
     if not db.get(models.Player, payload.batter_id):
         raise HTTPException(404, "Batter not found")
     if payload.pitcher_id and not db.get(models.Player, payload.pitcher_id):
@@ -31,6 +40,17 @@ def add_pa(payload: schemas.PACreate, db: Session = Depends(get_db)):
     pa = models.PlateAppearance(**payload.dict())
     db.add(pa)
     try:
+        # Insert first: a duplicate client_event_id fails here, before any counter moves
+        db.flush()
+        # A late PA on a final game changes its score: recount the result around it
+        final = game.status == models.GameStatus.final
+        if final:
+            apply_game_result(db, game, sign=-1)
+        apply_pa(db, pa, game)
+        bump_game_version(db, game)
+        if final:
+            apply_game_result(db, game)
+        publish_invalidation(db, game_ids=[game.id], season_ids=[game.season_id])
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -49,10 +69,60 @@ def add_pa(payload: schemas.PACreate, db: Session = Depends(get_db)):
         # If we get here, it was some other integrity error
         raise
     db.refresh(pa)
+
+    # Checkpoint derived counters every SNAPSHOT_INTERVAL events; a lost race is harmless
+    try:
+        if maybe_snapshot(db, pa.game_id):
+            db.commit()
+    except IntegrityError:
+        db.rollback()
     return pa
 
 @router.get("/boxscore/{game_id}", response_model=schemas.BoxScore)
 def get_boxscore(game_id: int, db: Session = Depends(get_db)):
-    if not db.get(models.Game, game_id):
+    game = db.get(models.Game, game_id)
+    if not game:
         raise HTTPException(404, "Game not found")
-    return compute_boxscore(db, game_id)
+    return stats_cache.get_or_compute(
+        "game", game_id, "boxscore",
+        lambda: compute_boxscore(db, game_id).model_copy(update={"version": game.version}),
+    )
+
+def _get_pa(db: Session, pa_id: int) -> tuple[models.PlateAppearance, models.Game]:
+    pa = db.get(models.PlateAppearance, pa_id)
+    if not pa:
+        raise HTTPException(404, "Plate appearance not found")
+    game = db.get(models.Game, pa.game_id)
+    if is_archived(game.season_id):
+        raise HTTPException(409, "Season is archived")
+    return pa, game
+
+@router.patch("/{pa_id}", response_model=schemas.PAOut)
+def update_pa(pa_id: int, body: schemas.PAUpdate, db: Session = Depends(get_db)):
+    pa, game = _get_pa(db, pa_id)
+    changes = body.dict(exclude_unset=True)
+    reason = changes.pop("reason", None)
+    if changes.get("batter_id") is not None and not db.get(models.Player, changes["batter_id"]):
+        raise HTTPException(404, "Batter not found")
+    if changes.get("pitcher_id") is not None and not db.get(models.Player, changes["pitcher_id"]):
+        raise HTTPException(404, "Pitcher not found")
+    for field in ("inning", "half", "batter_id", "result"):
+        if field in changes and changes[field] is None:
+            raise HTTPException(400, f"{field} cannot be null")
+    if "rbis" in changes and changes["rbis"] is None:
+        changes["rbis"] = 0
+    if not any(getattr(pa, k) != v for k, v in changes.items()):
+        return pa
+
+    correct_pa(db, pa, game, changes, reason)
+    db.commit()
+    db.refresh(pa)
+    return pa
+
+@router.delete("/{pa_id}", response_model=schemas.PACorrectionOut)
+def remove_pa(pa_id: int, reason: str | None = None, db: Session = Depends(get_db)):
+    pa, game = _get_pa(db, pa_id)
+    correction = delete_pa(db, pa, game, reason)
+    db.commit()
+    db.refresh(correction)
+    return correction
@@ -9,8 +9,22 @@ router = APIRouter(prefix="/players", tags=["players"])
 def create_player(payload: schemas.PlayerCreate, db: Session = Depends(get_db)):
     if not db.get(models.Team, payload.team_id):
         raise HTTPException(404, "Team not found")
+    if payload.person_id is not None and not db.get(models.Person, payload.person_id):
+        raise HTTPException(404, "Person not found")
     player = models.Player(**payload.dict())
     db.add(player)
     db.commit()
     db.refresh(player)
     return player
+
+@router.put("/{player_id}/person", response_model=schemas.PlayerOut)
+def link_person(player_id: int, body: schemas.PlayerLink, db: Session = Depends(get_db)):
+    player = db.get(models.Player, player_id)
+    if not player:
+        raise HTTPException(404, "Player not found")
+    if body.person_id is not None and not db.get(models.Person, body.person_id):
+        raise HTTPException(404, "Person not found")
+    player.person_id = body.person_id
+    db.commit()
+    db.refresh(player)
+    return player
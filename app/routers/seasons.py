@@ -2,7 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..db import get_db
 from .. import models, schemas
-from ..services.stats import compute_season_stats, compute_season_leaderboard, compute_season_pitching, compute_season_pitching_leaderboard
+from ..services.stats import (
+    compute_season_stats, compute_season_leaderboard, compute_season_pitching, compute_season_pitching_leaderboard,
+    league_constants, compute_standings, BATTING_METRICS, PITCHING_METRICS,
+)
+from ..services.cache import stats_cache
+from ..services.percentiles import PERCENTILE_MIN_PA, season_index, player_percentiles
 
 router = APIRouter(prefix="/seasons", tags=["seasons"])
 
@@ -18,33 +23,75 @@ def create_season(payload: schemas.SeasonCreate, db: Session = Depends(get_db)):
 def season_stats(season_id: int, db: Session = Depends(get_db)):
     if not db.get(models.Season, season_id):
         raise HTTPException(404, "Season not found")
-    return compute_season_stats(db, season_id)
+    return stats_cache.get_or_compute("season", season_id, "stats", lambda: compute_season_stats(db, season_id))
 
 @router.get("/{season_id}/leaderboard", response_model=list[schemas.PlayerStats])
 def season_leaderboard(
     season_id: int,
-    metric: str = Query("ops", pattern="^(avg|obp|slg|ops)$", description="Which metric to rank by"),
+    metric: str = Query(
+        "ops", pattern=f"^({'|'.join(BATTING_METRICS)})$", description="Which metric to rank by"
+    ),
     min_ab: int = Query(1, ge=0, description="Minimum at-bats to qualify"),
     limit: int = Query(10, ge=1, le=100, description="Max players to return"),
     db: Session = Depends(get_db),
 ):
     if not db.get(models.Season, season_id):
         raise HTTPException(404, "Season not found")
-    return compute_season_leaderboard(db, season_id, metric=metric, min_ab=min_ab, limit=limit)
+    return stats_cache.get_or_compute(
+        "season", season_id, ("leaderboard", metric, min_ab, limit),
+        lambda: compute_season_leaderboard(db, season_id, metric=metric, min_ab=min_ab, limit=limit),
+    )
 
 @router.get("/{season_id}/pitching", response_model=list[schemas.PitcherStats])
 def season_pitching(season_id: int, db: Session = Depends(get_db)):
     if not db.get(models.Season, season_id):
         raise HTTPException(404, "Season not found")
-    return compute_season_pitching(db, season_id)
+    return stats_cache.get_or_compute("season", season_id, "pitching", lambda: compute_season_pitching(db, season_id))
 
 @router.get("/{season_id}/pitching/leaderboard", response_model=list[schemas.PitcherStats])
 def season_pitching_leaderboard(
     season_id: int,
     min_ip: float = Query(0.0, ge=0.0, description="Minimum innings pitched to qualify (e.g., 10.0)"),
     limit: int = Query(10, ge=1, le=100, description="Max pitchers to return"),
+    metric: str = Query("era", pattern=f"^({'|'.join(PITCHING_METRICS)})$", description="Which metric to rank by"),
     db: Session = Depends(get_db),
 ):
     if not db.get(models.Season, season_id):
         raise HTTPException(404, "Season not found")
-    return compute_season_pitching_leaderboard(db, season_id, min_ip=min_ip, limit=limit)
\ No newline at end of file
+    return stats_cache.get_or_compute(
+        "season", season_id, ("pitching_leaderboard", metric, min_ip, limit),
+        lambda: compute_season_pitching_leaderboard(db, season_id, min_ip=min_ip, limit=limit, metric=metric),
+    )
+
+@router.get("/{season_id}/standings", response_model=list[schemas.StandingsRow])
+def season_standings(season_id: int, db: Session = Depends(get_db)):
+    if not db.get(models.Season, season_id):
+        raise HTTPException(404, "Season not found")
+    return stats_cache.get_or_compute("season", season_id, "standings", lambda: compute_standings(db, season_id))
+
+@router.get("/{season_id}/league", response_model=schemas.LeagueConstants)
+def season_league(season_id: int, db: Session = Depends(get_db)):
+    if not db.get(models.Season, season_id):
+        raise HTTPException(404, "Season not found")
+    return league_constants(db, season_id)
+
+@router.get("/{season_id}/players/{player_id}/percentiles", response_model=schemas.PlayerPercentiles)
+def season_player_percentiles(
+    season_id: int,
+    player_id: int,
+    min_pa: int = Query(PERCENTILE_MIN_PA, ge=0, description="Plate appearances needed to be in the comparison pool"),
+    db: Session = Depends(get_db),
+):
+    if not db.get(models.Season, season_id):
+        raise HTTPException(404, "Season not found")
+    index = season_index(db, season_id, min_pa)
+    pct = player_percentiles(index, player_id)
+    if pct is None:
+        raise HTTPException(404, "Player has no plate appearances this season")
+    line = index.lines[player_id]
+    return schemas.PlayerPercentiles(
+        season_id=season_id, player_id=player_id,
+        first_name=line.first_name, last_name=line.last_name,
+        pa=line.pa, min_pa=min_pa, qualified=line.pa >= min_pa,
+        pool_size=index.qualified_count, percentiles=pct,
+    )
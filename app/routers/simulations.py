@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from ..db import get_db
+from .. import models, schemas
+from ..services.jobs import start_job
+
+router = APIRouter(prefix="/simulations", tags=["simulations"])
+
+@router.post("/seasons/{season_id}", response_model=schemas.SimulationJobOut, status_code=202)
+def simulate_season(season_id: int, body: schemas.SimulationRequest, db: Session = Depends(get_db)):
+    if not db.get(models.Season, season_id):
+        raise HTTPException(404, "Season not found")
+    return start_job(db, "season", season_id, body.dict())
+
+@router.post("/games/{game_id}", response_model=schemas.SimulationJobOut, status_code=202)
+def simulate_game(game_id: int, body: schemas.SimulationRequest, db: Session = Depends(get_db)):
+    game = db.get(models.Game, game_id)
+    if not game:
+        raise HTTPException(404, "Game not found")
+    if game.status == models.GameStatus.final:
+        raise HTTPException(400, "Game is already final")
+    return start_job(db, "game", game_id, body.dict(exclude={"playoff_teams"}))
+
+@router.get("/{job_id}", response_model=schemas.SimulationJobOut)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(models.SimulationJob, job_id)
+    if not job:
+        raise HTTPException(404, "Simulation job not found")
+    return job
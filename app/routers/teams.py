@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from ..db import get_db
 from .. import models, schemas
+from ..services.stats import compute_team_stats
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
@@ -15,3 +16,11 @@ def create_team(payload: schemas.TeamCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(team)
     return team
+
+
+@router.get("/{team_id}/stats", response_model=schemas.TeamStats)
+def team_stats(team_id: int, db: Session = Depends(get_db)):
+    team = db.get(models.Team, team_id)
+    if not team:
+        raise HTTPException(404, "Team not found")
+    return compute_team_stats(db, team)
@@ -29,12 +29,26 @@ class PlayerCreate(BaseModel):
     first_name: str
     last_name: str
     handedness: Optional[str] = None
+    person_id: Optional[int] = None   # links this season's player to a person
 
 class PlayerOut(PlayerCreate):
     id: int
     class Config:
         from_attributes = True
 
+class PersonCreate(BaseModel):
+    first_name: str
+    last_name: str
+
+class PersonOut(PersonCreate):
+    id: int
+    player_ids: list[int] = []
+    class Config:
+        from_attributes = True
+
+class PlayerLink(BaseModel):
+    person_id: Optional[int] = None   # None unlinks
+
 # ---- Games & Lineups ----
 class GameCreate(BaseModel):
     season_id: int
@@ -45,9 +59,15 @@ class GameOut(GameCreate):
     id: int
     start_time: datetime
     status: GameStatus
+    home_score: int = 0
+    away_score: int = 0
+    version: int = 0
     class Config:
         from_attributes = True
 
+class GameStatusUpdate(BaseModel):
+    status: GameStatus
+
 class LineupEntry(BaseModel):
     team_id: int
     batting_order: int = Field(ge=1, le=9)
@@ -57,6 +77,23 @@ class LineupEntry(BaseModel):
 class LineupSet(BaseModel):
     entries: List[LineupEntry]
 
+class LineupSlot(BaseModel):
+    batting_order: int
+    player_id: int
+    first_name: str
+    last_name: str
+    defensive_position: Optional[str] = None
+
+class TeamLineup(BaseModel):
+    team_id: int
+    version: int
+    created_at: datetime
+    slots: list[LineupSlot]
+
+class GameLineup(BaseModel):
+    game_id: int
+    teams: list[TeamLineup]
+
 # ---- Plate Appearances ----
 class PACreate(BaseModel):
     game_id: int
@@ -75,11 +112,31 @@ class PAOut(PACreate):
     class Config:
         from_attributes = True
 
+class PAUpdate(BaseModel):
+    inning: Optional[int] = Field(default=None, ge=1)
+    half: Optional[HalfInning] = None
+    batter_id: Optional[int] = None
+    pitcher_id: Optional[int] = None
+    result: Optional[PAResult] = None
+    rbis: Optional[int] = None
+    notes: Optional[str] = None
+    reason: Optional[str] = None   # recorded in the audit trail
+
+class PACorrectionOut(BaseModel):
+    id: int
+    pa_id: int
+    game_id: int
+    action: str
+    before: dict
+    after: Optional[dict] = None
+    reason: Optional[str] = None
+    game_version: int
+    created_at: datetime
+    class Config:
+        from_attributes = True
+
 # ---- Stats ----
-class PlayerStats(BaseModel):
-    player_id: int
-    first_name: str
-    last_name: str
+class BattingLine(BaseModel):
     ab: int
     h: int
     bb: int
@@ -90,15 +147,36 @@ class PlayerStats(BaseModel):
     obp: float
     slg: float
     ops: float
+    pa: int = 0
+    doubles: int = 0
+    triples: int = 0
+    hr: int = 0
+    so: int = 0
+    iso: float = 0.0
+    babip: float = 0.0
+    k_pct: float = 0.0
+    bb_pct: float = 0.0
+    woba: float = 0.0
+    ops_plus: Optional[int] = None   # needs season league constants
+
+class PlayerStats(BattingLine):
+    player_id: int
+    first_name: str
+    last_name: str
+
+class MatchupStats(BaseModel):
+    batter_id: int
+    pitcher_id: int
+    pitcher_first_name: str
+    pitcher_last_name: str
+    batting: PlayerStats   # the batter's line against this pitcher (both season-scoped players)
 
 class BoxScore(BaseModel):
     game_id: int
     batting: list[PlayerStats]
+    version: int = 0   # game version the box score reflects
 
-class PitcherStats(BaseModel):
-    pitcher_id: int
-    first_name: str
-    last_name: str
+class PitchingLine(BaseModel):
     bf: int
     ab: int
     h: int
@@ -111,7 +189,117 @@ class PitcherStats(BaseModel):
     ip: str            # e.g., "5.2"
     ra: int            # runs allowed (RBIs proxy)
     era: float         # ERA (approx from RA)
+    k_pct: float = 0.0
+    bb_pct: float = 0.0
+    fip: Optional[float] = None   # needs season FIP constant
+
+class PitcherStats(PitchingLine):
+    pitcher_id: int
+    first_name: str
+    last_name: str
 
 class GamePitching(BaseModel):
     game_id: int
-    pitching: list[PitcherStats]
\ No newline at end of file
+    pitching: list[PitcherStats]
+    version: int = 0
+
+class PlayerPercentiles(BaseModel):
+    season_id: int
+    player_id: int
+    first_name: str
+    last_name: str
+    pa: int
+    min_pa: int
+    qualified: bool
+    pool_size: int                   # qualified hitters compared against
+    percentiles: dict[str, float]    # metric -> 0..100, higher is better
+
+class LeagueConstants(BaseModel):
+    season_id: int
+    pa: int
+    obp: float
+    slg: float
+    woba: float
+    era: float
+    k_pct: float
+    bb_pct: float
+    fip_constant: float
+
+class TeamStats(BaseModel):
+    team_id: int
+    season_id: int
+    name: str
+    wins: int
+    losses: int
+    ties: int
+    runs_for: int        # final games only (RBIs proxy)
+    runs_against: int
+    batting: BattingLine    # all recorded PAs, live games included
+    pitching: PitchingLine
+
+class StandingsRow(BaseModel):
+    team_id: int
+    name: str
+    wins: int
+    losses: int
+    ties: int
+    pct: float
+    runs_for: int
+    runs_against: int
+    run_diff: int
+    games_back: float
+
+class SimulationRequest(BaseModel):
+    n_sims: int = Field(default=10000, ge=100, le=200000)
+    seed: Optional[int] = Field(default=None, ge=0)  # random if omitted; echoed in the result
+    playoff_teams: Optional[int] = Field(default=None, ge=1)  # season runs only
+
+class SimulationJobOut(BaseModel):
+    id: int
+    kind: str
+    target_id: int
+    params: dict
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    class Config:
+        from_attributes = True
+
+class LineupOptimizeRequest(BaseModel):
+    player_ids: List[int] = Field(min_length=9, max_length=9)  # in the submitted batting order
+    top: int = Field(default=5, ge=1, le=20)
+    seed: int = Field(default=0, ge=0)  # local-search random starts
+
+class OrderScore(BaseModel):
+    player_ids: list[int]
+    expected_runs: float  # per nine innings
+
+class LineupOptimization(BaseModel):
+    game_id: int
+    team_id: int
+    current: OrderScore
+    best: list[OrderScore]
+    evaluated: int     # distinct orders scored
+    exhaustive: bool   # every distinct order was scored
+
+class CareerSeason(BaseModel):
+    season_id: int
+    player_id: int
+    team_id: int
+    batting: Optional[BattingLine] = None
+    pitching: Optional[PitchingLine] = None
+
+class Career(BaseModel):
+    person_id: int
+    first_name: str
+    last_name: str
+    batting: BattingLine    # OPS+ and FIP need per-season league context and are left empty
+    pitching: PitchingLine
+    seasons: list[CareerSeason]
+
+class CareerMatchup(BaseModel):
+    batter_person_id: int
+    pitcher_person_id: int
+    batting: BattingLine
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..models import (
+    Game, HalfInning, MatchupCounter, PlateAppearance, PlayerSeasonRollup, ResultCounters, TeamCounter, TeamRecord,
+)
+from .counters import COUNTER_FIELDS, RESULT_FIELDS, Counters
+
+def counters_from_row(row: ResultCounters) -> Counters:
+    return {f: getattr(row, f) or 0 for f in COUNTER_FIELDS}
+
+def _increment(db: Session, model, key: dict, deltas: dict[str, int], insert_values: dict | None = None) -> None:
+    """Add `deltas` to the row identified by `key`, creating it if needed (one statement).
+
+    `insert_values` are extra non-key columns only written when the row is created.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    insert_values = insert_values or {}
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(model).values(**key, **insert_values, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={k: getattr(model, k) + stmt.excluded[k] for k in deltas},
+        )
+        db.execute(stmt)
+        return
+    row = db.get(model, tuple(key.values()), with_for_update=True)
+    if row is None:
+        row = model(**key, **insert_values, **{f: 0 for f in deltas})
+        db.add(row)
+    for k, v in deltas.items():
+        setattr(row, k, (getattr(row, k) or 0) + v)
+    db.flush()
+
+def _pa_deltas(pa: PlateAppearance, sign: int) -> dict[str, int]:
+    return {RESULT_FIELDS[pa.result]: sign, "rbi": sign * (pa.rbis or 0)}
+
+def _batting_team(pa: PlateAppearance, game: Game) -> tuple[int, int]:
+    """(batting team, fielding team): visitors bat in the top half."""
+    if pa.half == HalfInning.top:
+        return game.away_team_id, game.home_team_id
+    return game.home_team_id, game.away_team_id
+
+def apply_pa(db: Session, pa: PlateAppearance, game: Game, sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) one PA's contribution to the incremental counter tables.
+
+    Runs inside the caller's transaction so the counters commit atomically with the event.
+    """
+    deltas = _pa_deltas(pa, sign)
+    if pa.pitcher_id is not None:
+        _increment(db, MatchupCounter, {"batter_id": pa.batter_id, "pitcher_id": pa.pitcher_id}, deltas)
+
+    batting_team, fielding_team = _batting_team(pa, game)
+    _increment(db, TeamCounter, {"team_id": batting_team, "side": "batting"}, deltas)
+    _increment(db, TeamCounter, {"team_id": fielding_team, "side": "pitching"}, deltas)
+
+    season = {"season_id": game.season_id}
+    _increment(db, PlayerSeasonRollup, {"player_id": pa.batter_id, "side": "batting"}, deltas, insert_values=season)
+    if pa.pitcher_id is not None:
+        _increment(db, PlayerSeasonRollup, {"player_id": pa.pitcher_id, "side": "pitching"}, deltas, insert_values=season)
+
+    runs = sign * (pa.rbis or 0)
+    if runs:
+        # SQL-side increment so concurrent PAs for the same game don't lose updates
+        if pa.half == HalfInning.top:
+            game.away_score = Game.away_score + runs
+        else:
+            game.home_score = Game.home_score + runs
+        db.flush()
+
+def apply_game_result(db: Session, game: Game, sign: int = 1) -> None:
+    """Count (sign=1) or uncount (sign=-1) a final game in both teams' records."""
+    home, away = game.home_score or 0, game.away_score or 0
+    for team_id, runs_for, runs_against in ((game.home_team_id, home, away), (game.away_team_id, away, home)):
+        _increment(
+            db, TeamRecord, {"team_id": team_id},
+            {
+                "wins": sign * (runs_for > runs_against),
+                "losses": sign * (runs_for < runs_against),
+                "ties": sign * (runs_for == runs_against),
+                "runs_for": sign * runs_for,
+                "runs_against": sign * runs_against,
+            },
+            insert_values={"season_id": game.season_id},
+        )
+
+def bump_game_version(db: Session, game: Game) -> int:
+    """Increment the game's version in SQL and return the new value."""
+    game.version = Game.version + 1
+    db.flush()
+    return game.version
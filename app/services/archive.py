@@ -0,0 +1,197 @@
+from __future__ import annotations
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models import Game, GameStatus, GameStatSnapshot, Lineup, PACorrection, PAResult, PlateAppearance, Player, Team
+from .counters import RESULT_FIELDS, Counters, new_counters
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+FORMAT_VERSION = 1
+
+# Result codes are positions in this list; the manifest records it so old archives stay readable
+RESULTS = list(PAResult)
+HALVES = ["top", "bottom"]
+
+PA_DTYPE = np.dtype([
+    ("id", "<i8"), ("game_id", "<i8"), ("batter_id", "<i8"), ("pitcher_id", "<i8"),  # pitcher_id -1 = unknown
+    ("result", "i1"), ("rbis", "<i2"), ("inning", "<i2"), ("half", "i1"),
+])
+PLAYER_DTYPE = np.dtype([
+    ("id", "<i8"), ("team_id", "<i8"), ("first_name", "U80"), ("last_name", "U80"), ("handedness", "U2"),
+])
+GAME_DTYPE = np.dtype([
+    ("id", "<i8"), ("home_team_id", "<i8"), ("away_team_id", "<i8"), ("start_time", "datetime64[us]"),
+])
+
+@dataclass(frozen=True)
+class ArchivedPlayer:
+    id: int
+    first_name: str
+    last_name: str
+
+@dataclass(frozen=True)
+class ArchivedSeason:
+    season_id: int
+    pa: np.ndarray       # memory-mapped, PA_DTYPE
+    players: np.ndarray  # memory-mapped, PLAYER_DTYPE
+    games: np.ndarray    # memory-mapped, GAME_DTYPE
+    results: list[PAResult]
+
+    def player(self, player_id: int) -> ArchivedPlayer | None:
+        i = np.searchsorted(self.players["id"], player_id)
+        if i < len(self.players) and self.players["id"][i] == player_id:
+            row = self.players[i]
+            return ArchivedPlayer(int(row["id"]), str(row["first_name"]), str(row["last_name"]))
+        return None
+
+def season_dir(season_id: int) -> Path:
+    return Path(ARCHIVE_DIR) / f"season_{season_id}"
+
+def is_archived(season_id: int) -> bool:
+    """Archived seasons are read-only: their stats are served from the files, not the database."""
+    return (season_dir(season_id) / "manifest.json").exists()
+
+def export_season(db: Session, season_id: int, delete: bool = False, force: bool = False) -> Path:
+    """Write a finished season's events, players and games as fixed-dtype .npy files.
+
+    The PA correction log goes alongside as corrections.json. With delete=True the
+    season's PAs, corrections, lineups, snapshots and games are removed from the database
+    (players and teams are kept: they are small and other tables reference them).
+    An existing archive is only replaced with force=True, and never once the season's
+    rows are gone from the database. The caller commits.
+    """
+    games = db.query(Game).filter(Game.season_id == season_id).order_by(Game.id).all()
+    if is_archived(season_id):
+        if not force:
+            raise ValueError(f"Season {season_id} is already archived; use force to overwrite it")
+        if not games:
+            raise ValueError(f"Season {season_id} has no games left in the database; its archive is the only copy")
+    live = [g.id for g in games if g.status != GameStatus.final]
+    if live:
+        raise ValueError(f"Season {season_id} still has live games: {live}")
+    game_ids = [g.id for g in games]
+
+    code = {r: i for i, r in enumerate(RESULTS)}
+    half = {h: i for i, h in enumerate(HALVES)}
+    pa_rows = (
+        db.query(
+            PlateAppearance.id, PlateAppearance.game_id, PlateAppearance.batter_id, PlateAppearance.pitcher_id,
+            PlateAppearance.result, PlateAppearance.rbis, PlateAppearance.inning, PlateAppearance.half,
+        )
+        .filter(PlateAppearance.game_id.in_(game_ids))
+        .order_by(PlateAppearance.id)
+        .all()
+    ) if game_ids else []
+    pa = np.array(
+        [(r.id, r.game_id, r.batter_id, -1 if r.pitcher_id is None else r.pitcher_id,
+          code[r.result], r.rbis or 0, r.inning, half[r.half.value]) for r in pa_rows],
+        dtype=PA_DTYPE,
+    )
+    players = np.array(
+        [(p.id, p.team_id, p.first_name, p.last_name, p.handedness or "")
+         for p in db.query(Player).join(Team, Team.id == Player.team_id)
+                    .filter(Team.season_id == season_id).order_by(Player.id)],
+        dtype=PLAYER_DTYPE,
+    )
+    game_arr = np.array(
+        [(g.id, g.home_team_id, g.away_team_id, np.datetime64(g.start_time or datetime(1970, 1, 1), "us"))
+         for g in games],
+        dtype=GAME_DTYPE,
+    )
+
+    corrections = [
+        {
+            "id": c.id, "pa_id": c.pa_id, "game_id": c.game_id, "action": c.action, "before": c.before,
+            "after": c.after, "reason": c.reason, "game_version": c.game_version,
+            "created_at": c.created_at.isoformat() if c.created_at else None,
+        }
+        for c in db.query(PACorrection).filter(PACorrection.game_id.in_(game_ids)).order_by(PACorrection.id)
+    ] if game_ids else []
+
+    final = season_dir(season_id)
+    tmp = final.with_name(final.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    np.save(tmp / "pa.npy", pa)
+    np.save(tmp / "players.npy", players)
+    np.save(tmp / "games.npy", game_arr)
+    (tmp / "corrections.json").write_text(json.dumps(corrections, indent=1))
+    (tmp / "manifest.json").write_text(json.dumps({
+        "season_id": season_id,
+        "format": FORMAT_VERSION,
+        "results": [r.value for r in RESULTS],
+        "halves": HALVES,
+        "counts": {"pa": len(pa), "players": len(players), "games": len(game_arr), "corrections": len(corrections)},
+        "created_at": datetime.utcnow().isoformat(),
+    }, indent=2))
+    shutil.rmtree(final, ignore_errors=True)
+    tmp.rename(final)
+
+    if delete and game_ids:
+        # Corrections are deleted explicitly (they were just exported) rather than left to
+        # the games FK cascade, which only PostgreSQL enforces
+        for model in (GameStatSnapshot, Lineup, PACorrection, PlateAppearance):
+            db.query(model).filter(model.game_id.in_(game_ids)).delete(synchronize_session=False)
+        db.query(Game).filter(Game.id.in_(game_ids)).delete(synchronize_session=False)
+    return final
+
+_open: dict[int, tuple[float, ArchivedSeason]] = {}
+_open_lock = threading.Lock()
+
+def open_season(season_id: int) -> ArchivedSeason | None:
+    """Memory-map an archived season, or None if it was never archived."""
+    manifest_path = season_dir(season_id) / "manifest.json"
+    try:
+        mtime = manifest_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    with _open_lock:
+        hit = _open.get(season_id)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported archive format {manifest.get('format')} for season {season_id}")
+    d = manifest_path.parent
+    archived = ArchivedSeason(
+        season_id=season_id,
+        pa=np.load(d / "pa.npy", mmap_mode="r"),
+        players=np.load(d / "players.npy", mmap_mode="r"),
+        games=np.load(d / "games.npy", mmap_mode="r"),
+        results=[PAResult(v) for v in manifest["results"]],
+    )
+    with _open_lock:
+        _open[season_id] = (mtime, archived)
+    return archived
+
+def _group(keys: np.ndarray, results: np.ndarray, rbis: np.ndarray, fields: list[str]) -> dict[int, Counters]:
+    ids, inv = np.unique(keys, return_inverse=True)
+    n = len(fields)
+    counts = np.bincount(inv * n + results, minlength=len(ids) * n).reshape(len(ids), n)
+    rbi = np.bincount(inv, weights=rbis, minlength=len(ids))
+    out: dict[int, Counters] = {}
+    for i, pid in enumerate(ids.tolist()):
+        c = new_counters()
+        for j, field in enumerate(fields):
+            c[field] += int(counts[i, j])
+        c["rbi"] = int(rbi[i])
+        out[pid] = c
+    return out
+
+def season_counters(archived: ArchivedSeason) -> tuple[dict[int, Counters], dict[int, Counters]]:
+    """Per-batter and per-pitcher counters straight off the memory-mapped columns."""
+    pa = archived.pa
+    fields = [RESULT_FIELDS[r] for r in archived.results]
+    results = pa["result"].astype(np.intp)
+    rbis = pa["rbis"]
+    batting = _group(pa["batter_id"], results, rbis, fields)
+    has_pitcher = pa["pitcher_id"] >= 0
+    pitching = _group(pa["pitcher_id"][has_pitcher], results[has_pitcher], rbis[has_pitcher], fields)
+    return batting, pitching
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+Scope = tuple[str, int]  # ("game", id) or ("season", id)
+
+class StatsCache:
+    """In-process cache of derived stats, scoped by game and season.
+
+    Every write that changes a game or season invalidates its scope (locally after
+    commit, and on other workers via NOTIFY; see notify.py). A value computed while
+    its scope was being invalidated is returned but not stored.
+
+    Both levels are LRU-bounded: keys built from query parameters (leaderboard limits,
+    qualifying minimums) would otherwise let one scope grow without limit.
+    """
+
+    def __init__(self, max_scopes: int = 2048, max_entries_per_scope: int = 512):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Scope, OrderedDict[Hashable, Any]] = OrderedDict()
+        self._versions: dict[Scope, int] = {}
+        self._epoch = 0
+        self.max_scopes = max_scopes
+        self.max_entries_per_scope = max_entries_per_scope
+
+    def version(self, scope: str, scope_id: int) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._versions.get((scope, scope_id), 0)
+
+    def get_or_compute(self, scope: str, scope_id: int, key: Hashable, compute: Callable[[], Any]) -> Any:
+        k = (scope, scope_id)
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is not None and key in entry:
+                self._entries.move_to_end(k)
+                entry.move_to_end(key)
+                return entry[key]
+            token = (self._epoch, self._versions.get(k, 0))
+
+        value = compute()
+
+        with self._lock:
+            if token == (self._epoch, self._versions.get(k, 0)):
+                entry = self._entries.setdefault(k, OrderedDict())
+                entry[key] = value
+                entry.move_to_end(key)
+                while len(entry) > self.max_entries_per_scope:
+                    entry.popitem(last=False)
+                self._entries.move_to_end(k)
+                while len(self._entries) > self.max_scopes:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, game_ids: Iterable[int] = (), season_ids: Iterable[int] = ()) -> None:
+        with self._lock:
+            for k in [("game", int(i)) for i in game_ids] + [("season", int(i)) for i in season_ids]:
+                self._entries.pop(k, None)
+                self._versions[k] = self._versions.get(k, 0) + 1
+
+    def flush(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._epoch += 1
+
+stats_cache = StatsCache()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+from sqlalchemy.orm import Session
+from ..models import Game, GameStatus, PACorrection, PlateAppearance
+from .aggregates import apply_game_result, apply_pa, bump_game_version
+from .notify import publish_invalidation
+from .snapshots import apply_correction
+
+# Fields a correction may change
+EDITABLE = ("inning", "half", "batter_id", "pitcher_id", "result", "rbis", "notes")
+
+def _fields(pa: PlateAppearance) -> dict:
+    return {
+        "inning": pa.inning, "half": pa.half.value, "batter_id": pa.batter_id, "pitcher_id": pa.pitcher_id,
+        "result": pa.result.value, "rbis": pa.rbis or 0, "notes": pa.notes,
+    }
+
+def _event(pa: PlateAppearance) -> tuple:
+    return pa.batter_id, pa.pitcher_id, pa.result, pa.rbis
+
+def _correct(db: Session, pa: PlateAppearance, game: Game, changes: dict | None, reason: str | None) -> PACorrection:
+    before = _fields(pa)
+    # Transient copy of the PA as it was, for subtracting its old contribution
+    old = PlateAppearance(game_id=pa.game_id, **{k: getattr(pa, k) for k in EDITABLE})
+
+    # A final game's W-L depends on the score; take it out and put it back after the change
+    final = game.status == GameStatus.final
+    if final:
+        apply_game_result(db, game, sign=-1)
+
+    apply_pa(db, old, game, sign=-1)
+    if changes is None:
+        apply_correction(db, game.id, pa.id, _event(old), None)
+        db.delete(pa)
+        after = None
+    else:
+        for k, v in changes.items():
+            setattr(pa, k, v)
+        apply_pa(db, pa, game)
+        apply_correction(db, game.id, pa.id, _event(old), _event(pa))
+        after = _fields(pa)
+
+    version = bump_game_version(db, game)
+    if final:
+        apply_game_result(db, game)
+
+    correction = PACorrection(
+        pa_id=pa.id, game_id=game.id, action="delete" if changes is None else "update",
+        before=before, after=after, reason=reason, game_version=version,
+    )
+    db.add(correction)
+    publish_invalidation(db, game_ids=[game.id], season_ids=[game.season_id])
+    return correction
+
+def correct_pa(db: Session, pa: PlateAppearance, game: Game, changes: dict, reason: str | None = None) -> PACorrection:
+    """Edit a recorded PA, moving every derived counter by the difference. Caller commits."""
+    return _correct(db, pa, game, changes, reason)
+
+def delete_pa(db: Session, pa: PlateAppearance, game: Game, reason: str | None = None) -> PACorrection:
+    """Remove a recorded PA and its contribution to every derived counter. Caller commits."""
+    return _correct(db, pa, game, None, reason)
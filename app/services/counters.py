@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import Iterable
+from ..models import PAResult
+
+# One counter per PA outcome, plus RBIs (runs scored for batters, runs allowed for pitchers)
+RESULT_FIELDS = {
+    PAResult.SINGLE: "singles",
+    PAResult.DOUBLE: "doubles",
+    PAResult.TRIPLE: "triples",
+    PAResult.HOMERUN: "hr",
+    PAResult.WALK: "bb",
+    PAResult.HBP: "hbp",
+    PAResult.STRIKEOUT: "so",
+    PAResult.SAC_FLY: "sf",
+    PAResult.OUT: "other_outs",
+}
+COUNTER_FIELDS = tuple(RESULT_FIELDS.values()) + ("rbi",)
+
+Counters = dict[str, int]
+
+def new_counters() -> Counters:
+    return dict.fromkeys(COUNTER_FIELDS, 0)
+
+def tally(c: Counters, result: PAResult, rbis: int | None, sign: int = 1) -> None:
+    c[RESULT_FIELDS[result]] += sign
+    c["rbi"] += sign * (rbis or 0)
+
+def fold(
+    batting: dict[int, Counters],
+    pitching: dict[int, Counters],
+    rows: Iterable[tuple[int, int | None, PAResult, int | None]],
+    sign: int = 1,
+) -> int:
+    """Fold (batter_id, pitcher_id, result, rbis) rows into the counter maps; returns rows folded.
+
+    sign=-1 takes previously folded rows back out.
+    """
+    n = 0
+    for batter_id, pitcher_id, result, rbis in rows:
+        c = batting.get(batter_id)
+        if c is None:
+            c = batting[batter_id] = new_counters()
+        tally(c, result, rbis, sign)
+        if pitcher_id is not None:
+            c = pitching.get(pitcher_id)
+            if c is None:
+                c = pitching[pitcher_id] = new_counters()
+            tally(c, result, rbis, sign)
+        n += 1
+    return n
+
+def prune(counters: dict[int, Counters]) -> dict[int, Counters]:
+    """Drop players left with no events (every event bumps one result counter)."""
+    return {pid: c for pid, c in counters.items() if any(c[f] for f in RESULT_FIELDS.values())}
+
+def encode(counters: dict[int, Counters]) -> dict[str, Counters]:
+    # JSON object keys are strings; copy so later folds don't mutate a pending row
+    return {str(pid): dict(c) for pid, c in counters.items()}
+
+def decode(payload: dict[str, Counters] | None) -> dict[int, Counters]:
+    out: dict[int, Counters] = {}
+    for pid, c in (payload or {}).items():
+        merged = new_counters()
+        merged.update(c)
+        out[int(pid)] = merged
+    return out
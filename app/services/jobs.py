@@ -0,0 +1,143 @@
+from __future__ import annotations
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, sessionmaker
+from ..models import Game, SimulationJob
+from . import simulation
+
+log = logging.getLogger(__name__)
+
+# Threads only coordinate: they read the inputs, wait on the process pool and store results
+_coordinator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sim-job")
+
+# Jobs are leased by the process that accepted them; a lease not renewed in time means
+# the process is gone and the job will never finish
+JOB_HEARTBEAT_S = float(os.getenv("JOB_HEARTBEAT_S", "10"))
+JOB_LEASE_S = float(os.getenv("JOB_LEASE_S", "60"))
+ACTIVE = ("queued", "running")
+
+_owner: tuple[int, str] | None = None
+
+def owner() -> str:
+    """This process's job owner id (host, pid and a boot nonce; new after a fork)."""
+    global _owner
+    pid = os.getpid()
+    if _owner is None or _owner[0] != pid:
+        _owner = (pid, f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}")
+    return _owner[1]
+
+def _season(db: Session, target_id: int, params: dict) -> dict:
+    return simulation.simulate_season(db, target_id, params["n_sims"], params["seed"], params.get("playoff_teams"))
+
+def _game(db: Session, target_id: int, params: dict) -> dict:
+    return simulation.simulate_game_odds(db, db.get(Game, target_id), params["n_sims"], params["seed"])
+
+RUNNERS = {"season": _season, "game": _game}
+
+def run_job(session_factory, job_id: int) -> None:
+    """Run a queued job to completion, recording its result or error."""
+    db = session_factory()
+    try:
+        me = owner()
+        claimed = (
+            db.query(SimulationJob)
+              .filter(SimulationJob.id == job_id, SimulationJob.status == "queued")
+              .update({"status": "running", "owner": me, "heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        db.commit()
+        if not claimed:
+            return
+        job = db.get(SimulationJob, job_id)
+        try:
+            outcome = {"status": "done", "result": RUNNERS[job.kind](db, job.target_id, job.params)}
+        except Exception as exc:
+            log.exception("Simulation job %s failed", job_id)
+            db.rollback()
+            outcome = {"status": "failed", "error": str(exc)[:500]}
+        # Only while still ours: a job whose lease lapsed has already been failed
+        db.query(SimulationJob).filter(
+            SimulationJob.id == job_id, SimulationJob.owner == me, SimulationJob.status == "running",
+        ).update({**outcome, "finished_at": datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def start_job(db: Session, kind: str, target_id: int, params: dict) -> SimulationJob:
+    """Queue a simulation and return its job row; it runs in the background."""
+    params = dict(params)
+    if params.get("seed") is None:
+        params["seed"] = int(np.random.SeedSequence().entropy % 2**63)
+    job = SimulationJob(kind=kind, target_id=target_id, params=params, status="queued",
+                        owner=owner(), heartbeat_at=datetime.utcnow())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _coordinator.submit(run_job, sessionmaker(bind=db.get_bind(), autoflush=False), job.id)
+    return job
+
+def renew_leases(db: Session) -> int:
+    """Extend the leases of this process's unfinished jobs. The caller commits."""
+    return (
+        db.query(SimulationJob)
+          .filter(SimulationJob.owner == owner(), SimulationJob.status.in_(ACTIVE))
+          .update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+    )
+
+def fail_stale(db: Session, lease_s: float = JOB_LEASE_S) -> int:
+    """Mark unfinished jobs whose owner stopped renewing their lease as failed. The caller commits."""
+    expired = datetime.utcnow() - timedelta(seconds=lease_s)
+    return (
+        db.query(SimulationJob)
+          .filter(
+              SimulationJob.status.in_(ACTIVE),
+              or_(SimulationJob.heartbeat_at.is_(None), SimulationJob.heartbeat_at < expired),
+          )
+          .update({"status": "failed", "error": "Interrupted: the server running it stopped", "finished_at": datetime.utcnow()},
+                  synchronize_session=False)
+    )
+
+class LeaseKeeper:
+    """Background thread that renews this process's job leases and fails expired ones."""
+
+    def __init__(self, session_factory, interval: float = JOB_HEARTBEAT_S):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sim-job-leases", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout if timeout is not None else self.interval + 1)
+
+    def tick(self) -> None:
+        with self.session_factory() as db:
+            renew_leases(db)
+            failed = fail_stale(db)
+            db.commit()
+        if failed:
+            log.warning("Failed %d simulation jobs whose server stopped", failed)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.tick()
+            except Exception:
+                log.exception("Simulation job lease upkeep failed")
+            if self._stop.wait(self.interval):
+                return
+
+def shutdown() -> None:
+    _coordinator.shutdown(wait=False, cancel_futures=True)
+    simulation.shutdown()
@@ -0,0 +1,195 @@
+from __future__ import annotations
+import math
+from collections import Counter
+from dataclasses import dataclass
+from itertools import combinations
+import numpy as np
+from sqlalchemy.orm import Session
+from .cache import stats_cache
+from .simulation import NEXT_BASES, OUTS_ADDED, RUNS, N_OUTCOMES, league_rates, outcome_rates
+from .stats import _season_counters
+
+N_STATES = 24             # 8 base states x 0-2 outs; three outs is absorbing
+INNINGS = 9
+MAX_INNING_PA = 30        # stop propagating once this many have batted in an inning...
+MASS_TOL = 1e-7           # ...or the probability the inning is still going drops below this
+EXHAUSTIVE_LIMIT = 5040   # score every distinct order when there are at most this many
+EVAL_CHUNK = 1024         # orders scored per matrix pass, bounding the working set
+N_STARTS = 8              # local-search starting orders
+
+@dataclass(frozen=True)
+class Transitions:
+    """One hitter's base/out Markov chain, states indexed bases + 8 * outs."""
+    moves: np.ndarray   # (24, 24) probability of each next non-absorbing state
+    runs: np.ndarray    # (24,) expected runs scored on the PA from each state
+    ends: np.ndarray    # (24,) probability the PA makes the third out
+    obp: float
+
+def transitions(rates: np.ndarray) -> Transitions:
+    moves = np.zeros((N_STATES, N_STATES))
+    runs = np.zeros(N_STATES)
+    ends = np.zeros(N_STATES)
+    for outs in range(3):
+        for b in range(8):
+            s = b + 8 * outs
+            for o, p in enumerate(rates):
+                after = outs + OUTS_ADDED[o]
+                runs[s] += p * RUNS[o, b, outs]
+                if after >= 3:
+                    ends[s] += p
+                else:
+                    moves[s, NEXT_BASES[o, b, outs] + 8 * after] += p
+    obp = float(1 - sum(rates[o] for o in range(N_OUTCOMES) if OUTS_ADDED[o]))
+    return Transitions(moves, runs, ends, obp)
+
+def player_transitions(db: Session, season_id: int, player_ids: list[int]) -> dict[int, Transitions]:
+    """Each player's chain from their season PA results, cached per season cache version."""
+    out: dict[int, Transitions] = {}
+    counters = None
+    for pid in player_ids:
+        def compute(pid=pid):
+            nonlocal counters
+            if counters is None:
+                batting, _ = _season_counters(db, season_id)
+                counters = (batting, league_rates(batting))
+            batting, league = counters
+            return transitions(outcome_rates(batting.get(pid), league))
+        out[pid] = stats_cache.get_or_compute("season", season_id, ("markov", pid), compute)
+    return out
+
+def expected_runs(orders: np.ndarray, moves: np.ndarray, runs: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Expected runs per nine innings for each row of `orders` (indices into the chain arrays).
+
+    For every order and every possible leadoff slot, the distribution over the 24 states is
+    pushed forward one PA at a time, all orders and leadoffs in one matrix product per PA.
+    That gives runs per inning by leadoff and where the next inning starts; nine innings
+    follow from the leadoff distribution.
+    """
+    n_orders, n_classes = len(orders), len(moves)
+    stacked_moves = moves.transpose(1, 0, 2).reshape(N_STATES, n_classes * N_STATES)
+    mass = np.zeros((n_orders * 9, N_STATES))
+    mass[:, 0] = 1.0
+    inning_runs = np.zeros((n_orders, 9))
+    next_leadoff = np.zeros((n_orders, 9, 9))
+    leadoffs = np.arange(9)
+    rows = np.arange(n_orders * 9)
+    for k in range(MAX_INNING_PA):
+        batter = orders[:, (leadoffs + k) % 9].reshape(-1)
+        inning_runs += (mass @ runs.T)[rows, batter].reshape(n_orders, 9)
+        next_leadoff[:, leadoffs, (leadoffs + k + 1) % 9] += (mass @ ends.T)[rows, batter].reshape(n_orders, 9)
+        mass = (mass @ stacked_moves).reshape(-1, n_classes, N_STATES)[rows, batter]
+        if mass.sum() < MASS_TOL * len(mass):
+            break
+
+    total = np.zeros(n_orders)
+    up = np.zeros((n_orders, 9))
+    up[:, 0] = 1.0
+    for _ in range(INNINGS):
+        total += (up * inning_runs).sum(axis=1)
+        up = np.einsum("bj,bjk->bk", up, next_leadoff)
+    return total
+
+def _evaluate(orders: list[tuple[int, ...]], chains: tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    # Inline on purpose: the process pool's queue can hold a long season simulation, and
+    # a full exhaustive search scores in well under a second here
+    arr = np.array(orders, np.intp)
+    return np.concatenate([expected_runs(arr[i:i + EVAL_CHUNK], *chains) for i in range(0, len(arr), EVAL_CHUNK)])
+
+def _distinct_orders(classes: list[int]):
+    """Every distinct arrangement of a multiset of class ids."""
+    counts = Counter(classes)
+    order: list[int] = []
+
+    def walk():
+        if len(order) == len(classes):
+            yield tuple(order)
+            return
+        for c in sorted(counts):
+            if counts[c]:
+                counts[c] -= 1
+                order.append(c)
+                yield from walk()
+                order.pop()
+                counts[c] += 1
+    return walk()
+
+def _arrangements(classes: list[int]) -> int:
+    return math.factorial(len(classes)) // math.prod(math.factorial(n) for n in Counter(classes).values())
+
+@dataclass
+class OptimizeResult:
+    current: tuple[list[int], float]
+    best: list[tuple[list[int], float]]
+    evaluated: int
+    exhaustive: bool
+
+def optimize(chains_by_player: dict[int, Transitions], player_ids: list[int], top: int = 5, seed: int = 0) -> OptimizeResult:
+    """Best batting orders for nine players by Markov expected runs.
+
+    Hitters with identical chains are interchangeable, so orders are searched as sequences
+    of equivalence classes and every class sequence is scored once. Small class spaces are
+    searched exhaustively; otherwise steepest-ascent pairwise swaps from several starts.
+    """
+    # Symmetry reduction: one class per distinct chain
+    class_of, reps = {}, []
+    for pid in player_ids:
+        t = chains_by_player[pid]
+        for c, rep in enumerate(reps):
+            if np.array_equal(rep.moves, t.moves) and np.array_equal(rep.runs, t.runs):
+                class_of[pid] = c
+                break
+        else:
+            class_of[pid] = len(reps)
+            reps.append(t)
+    chains = (
+        np.stack([t.moves for t in reps]), np.stack([t.runs for t in reps]), np.stack([t.ends for t in reps]),
+    )
+    classes = [class_of[pid] for pid in player_ids]
+    scores: dict[tuple[int, ...], float] = {}
+
+    def score(orders) -> None:
+        todo = list(dict.fromkeys(o for o in orders if o not in scores))
+        if todo:
+            scores.update(zip(todo, _evaluate(todo, chains).tolist()))
+
+    exhaustive = _arrangements(classes) <= EXHAUSTIVE_LIMIT
+    if exhaustive:
+        score(list(_distinct_orders(classes)))
+    else:
+        rng = np.random.default_rng(seed)
+        by_obp = sorted(classes, key=lambda c: -reps[c].obp)
+        by_runs = sorted(classes, key=lambda c: -reps[c].runs.sum())
+        starts = [tuple(classes), tuple(by_obp), tuple(by_runs)]
+        starts += [tuple(rng.permutation(classes).tolist()) for _ in range(N_STARTS - len(starts))]
+        score(starts)
+        current = list(dict.fromkeys(starts))
+        swaps = list(combinations(range(9), 2))
+        while current:
+            neighbours = {}
+            for order in current:
+                for i, j in swaps:
+                    if order[i] != order[j]:
+                        swapped = list(order)
+                        swapped[i], swapped[j] = swapped[j], swapped[i]
+                        neighbours.setdefault(order, []).append(tuple(swapped))
+            score([o for ns in neighbours.values() for o in ns])
+            improved = []
+            for order, ns in neighbours.items():
+                best = max(ns, key=scores.__getitem__)
+                if scores[best] > scores[order] + 1e-12:
+                    improved.append(best)
+            current = list(dict.fromkeys(improved))
+
+    # Back from class sequences to players, keeping the submitted order within a class
+    def players(order: tuple[int, ...]) -> list[int]:
+        pools = {c: [pid for pid in player_ids if class_of[pid] == c] for c in set(classes)}
+        return [pools[c].pop(0) for c in order]
+
+    # The submitted order is always scored: it is one of the starts, or in the full enumeration
+    ranked = sorted(scores.items(), key=lambda kv: -kv[1])[:top]
+    return OptimizeResult(
+        current=(list(player_ids), scores[tuple(classes)]),
+        best=[(players(order), runs) for order, runs in ranked],
+        evaluated=len(scores),
+        exhaustive=exhaustive,
+    )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+from ..models import Lineup, Player
+from ..schemas import GameLineup, LineupSlot, TeamLineup
+
+def _current_versions(db: Session, game_ids: list[int]):
+    return (
+        db.query(Lineup.game_id, Lineup.team_id, func.max(Lineup.version).label("version"))
+          .filter(Lineup.game_id.in_(game_ids))
+          .group_by(Lineup.game_id, Lineup.team_id)
+          .subquery()
+    )
+
+def _current(db: Session, query, game_ids: list[int]):
+    current = _current_versions(db, game_ids)
+    return query.join(current, and_(
+        current.c.game_id == Lineup.game_id,
+        current.c.team_id == Lineup.team_id,
+        current.c.version == Lineup.version,
+    ))
+
+def latest_versions(db: Session, game_id: int) -> dict[int, int]:
+    """Current lineup version per team (teams without a lineup are absent)."""
+    return dict(
+        db.query(Lineup.team_id, func.max(Lineup.version))
+          .filter(Lineup.game_id == game_id)
+          .group_by(Lineup.team_id)
+          .all()
+    )
+
+def current_orders(db: Session, game_ids: list[int]) -> dict[tuple[int, int], list[int]]:
+    """Player IDs in batting order for each (game, team) current lineup."""
+    if not game_ids:
+        return {}
+    query = db.query(Lineup.game_id, Lineup.team_id, Lineup.player_id).filter(Lineup.game_id.in_(game_ids))
+    out: dict[tuple[int, int], list[int]] = {}
+    for game_id, team_id, player_id in _current(db, query, game_ids).order_by(
+        Lineup.game_id, Lineup.team_id, Lineup.batting_order
+    ):
+        out.setdefault((game_id, team_id), []).append(player_id)
+    return out
+
+def read_lineup(db: Session, game_id: int, version: int | None = None, team_id: int | None = None) -> GameLineup:
+    """Lineups with player names in one query: current for both teams (or ``team_id``), or a given version.
+
+    Versions are numbered per team, so reading an earlier ``version`` requires ``team_id``.
+    """
+    if version is not None and team_id is None:
+        raise ValueError("Lineup versions are per team; pass team_id with version")
+    query = (
+        db.query(Lineup, Player.first_name, Player.last_name)
+          .join(Player, Player.id == Lineup.player_id)
+          .filter(Lineup.game_id == game_id)
+    )
+    if team_id is not None:
+        query = query.filter(Lineup.team_id == team_id)
+    query = _current(db, query, [game_id]) if version is None else query.filter(Lineup.version == version)
+    teams: dict[int, TeamLineup] = {}
+    for row, first_name, last_name in query.order_by(Lineup.team_id, Lineup.batting_order):
+        team = teams.get(row.team_id)
+        if team is None:
+            team = teams[row.team_id] = TeamLineup(
+                team_id=row.team_id, version=row.version, created_at=row.created_at, slots=[],
+            )
+        team.slots.append(LineupSlot(
+            batting_order=row.batting_order, player_id=row.player_id, first_name=first_name,
+            last_name=last_name, defensive_position=row.defensive_position,
+        ))
+    return GameLineup(game_id=game_id, teams=list(teams.values()))
@@ -0,0 +1,132 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import select
+import threading
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import event, text
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session
+from .cache import StatsCache, stats_cache
+
+log = logging.getLogger(__name__)
+
+CHANNEL = os.getenv("STATS_NOTIFY_CHANNEL", "scorecard_stats")
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD = 7900
+
+_PENDING_KEY = "stats_invalidations"
+
+def publish_invalidation(db: Session, game_ids=(), season_ids=()) -> None:
+    """Invalidate cached stats for these games/seasons once the current transaction commits.
+
+    The local cache is cleared after commit; other workers are told via NOTIFY,
+    which PostgreSQL only delivers if the transaction commits.
+    """
+    games = sorted({int(i) for i in game_ids if i is not None})
+    seasons = sorted({int(i) for i in season_ids if i is not None})
+    pending = db.info.setdefault(_PENDING_KEY, ([], []))
+    pending[0].extend(games)
+    pending[1].extend(seasons)
+
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    payload = json.dumps({"games": games, "seasons": seasons})
+    if len(payload) > _MAX_PAYLOAD:
+        payload = json.dumps({"flush": True})
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        stats_cache.invalidate(game_ids=pending[0], season_ids=pending[1])
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+class CacheListener:
+    """Background thread that LISTENs for invalidations published by any worker.
+
+    Notifications sent while the connection is down are lost, so the whole cache is
+    flushed every time a (re)connect succeeds.
+    """
+
+    def __init__(
+        self,
+        url: URL | str,
+        cache: StatsCache = stats_cache,
+        channel: str = CHANNEL,
+        poll_timeout: float = 5.0,
+        max_backoff: float = 30.0,
+    ):
+        if isinstance(url, URL):
+            url = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self.dsn = url
+        self.cache = cache
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.max_backoff = max_backoff
+        self.connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stats-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout if timeout is not None else self.poll_timeout + 1)
+
+    def handle(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            log.warning("Unreadable stats notification %r; flushing cache", payload)
+            self.cache.flush()
+            return
+        if data.get("flush"):
+            self.cache.flush()
+        else:
+            self.cache.invalidate(game_ids=data.get("games", ()), season_ids=data.get("seasons", ()))
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                conn = psycopg2.connect(self.dsn)
+            except psycopg2.Error as e:
+                log.warning("Stats listener cannot connect (%s); retrying in %.0fs", e, backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = 1.0
+            try:
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                # Anything published before LISTEN took effect may have been missed
+                self.cache.flush()
+                self.connected.set()
+                self._listen(conn)
+            except psycopg2.Error as e:
+                log.warning("Stats listener lost its connection (%s); reconnecting", e)
+            finally:
+                self.connected.clear()
+                conn.close()
+
+    def _listen(self, conn) -> None:
+        while not self._stop.is_set():
+            if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                # Idle: a query surfaces a dead connection that select() alone would not
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                continue
+            conn.poll()
+            while conn.notifies:
+                self.handle(conn.notifies.pop(0).payload)
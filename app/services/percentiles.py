@@ -0,0 +1,56 @@
+from __future__ import annotations
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from ..schemas import PlayerStats
+from .cache import stats_cache
+from .stats import BATTING_LOWER_IS_BETTER, BATTING_METRICS, compute_season_stats
+
+# Default qualification threshold for the comparison pool
+PERCENTILE_MIN_PA = int(os.getenv("PERCENTILE_MIN_PA", "50"))
+
+@dataclass(frozen=True)
+class SeasonMetricIndex:
+    min_pa: int
+    lines: dict[int, PlayerStats]          # every hitter in the season, qualified or not
+    sorted_values: dict[str, list[float]]  # ascending, qualified hitters only
+
+    @property
+    def qualified_count(self) -> int:
+        return len(next(iter(self.sorted_values.values()), []))
+
+def build_index(stats: list[PlayerStats], min_pa: int) -> SeasonMetricIndex:
+    qualified = [s for s in stats if s.pa >= min_pa]
+    sorted_values = {
+        m: sorted(v for v in (getattr(s, m) for s in qualified) if v is not None)
+        for m in BATTING_METRICS
+    }
+    return SeasonMetricIndex(min_pa=min_pa, lines={s.player_id: s for s in stats}, sorted_values=sorted_values)
+
+def season_index(db: Session, season_id: int, min_pa: int = PERCENTILE_MIN_PA) -> SeasonMetricIndex:
+    """Sorted per-metric arrays for the season, built once per season cache version."""
+    return stats_cache.get_or_compute(
+        "season", season_id, ("percentile_index", min_pa),
+        lambda: build_index(compute_season_stats(db, season_id), min_pa),
+    )
+
+def percentile_rank(sorted_values: list[float], value: float, lower_is_better: bool = False) -> float:
+    """Mid-rank percentile (0-100) of `value` within an ascending list."""
+    n = len(sorted_values)
+    if not n:
+        return 0.0
+    below = bisect_left(sorted_values, value)
+    ties = bisect_right(sorted_values, value) - below
+    pct = 100.0 * (below + 0.5 * ties) / n
+    return round(100.0 - pct if lower_is_better else pct, 1)
+
+def player_percentiles(index: SeasonMetricIndex, player_id: int) -> dict[str, float] | None:
+    line = index.lines.get(player_id)
+    if line is None:
+        return None
+    return {
+        m: percentile_rank(values, getattr(line, m), m in BATTING_LOWER_IS_BETTER)
+        for m, values in index.sorted_values.items()
+        if getattr(line, m) is not None
+    }
@@ -0,0 +1,381 @@
+from __future__ import annotations
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models import Game, GameStatus, HalfInning, PlateAppearance, Player, Team, TeamRecord
+from .counters import RESULT_FIELDS, Counters
+from .lineups import current_orders
+from .stats import _season_counters
+
+# Outcome columns of every probability table, in counter order
+OUTCOMES = tuple(RESULT_FIELDS.values())
+N_OUTCOMES = len(OUTCOMES)
+
+# Used when a season has no PAs yet (rough league-wide mix)
+DEFAULT_RATES = {
+    "singles": 0.15, "doubles": 0.045, "triples": 0.005, "hr": 0.03, "bb": 0.08,
+    "hbp": 0.01, "so": 0.22, "sf": 0.02, "other_outs": 0.44,
+}
+# Pseudo-PAs of league-average performance blended into every player's rates
+SIM_PRIOR_PA = float(os.getenv("SIM_PRIOR_PA", "60"))
+# Worker processes; 0 runs simulations in the calling thread
+SIM_WORKERS = int(os.getenv("SIM_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Simulations per task; fixed so results don't depend on the worker count
+SIM_CHUNK = 1000
+GAME_BLOCK = 128
+SIM_PLAYOFF_TEAMS = int(os.getenv("SIM_PLAYOFF_TEAMS", "4"))
+MAX_INNINGS = 15  # still tied after this many innings counts as a tie
+LUT_BINS = 1024  # inverse-CDF table resolution for outcome draws
+MAX_GAME_PA = 400  # guard against lineups that can't make outs
+
+def _transitions() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(next bases, runs) indexed [outcome, bases, outs] and outs added per outcome.
+
+    Bases are a bitmask (1 = first, 2 = second, 4 = third). Simplified advancement:
+    singles and doubles score runners from second and third, a runner on first takes
+    one extra base; walks only force; outs don't advance runners except a sac fly with
+    fewer than two outs, which scores the runner from third.
+    """
+    next_bases = np.zeros((N_OUTCOMES, 8, 3), np.int8)
+    runs = np.zeros((N_OUTCOMES, 8, 3), np.int8)
+    outs_added = np.zeros(N_OUTCOMES, np.int8)
+    for o, field in enumerate(OUTCOMES):
+        for b in range(8):
+            on1, on2, on3 = b & 1, b >> 1 & 1, b >> 2 & 1
+            for outs in range(3):
+                nb, r = b, 0
+                if field == "singles":
+                    nb, r = 1 | on1 << 1, on2 + on3
+                elif field == "doubles":
+                    nb, r = 2 | on1 << 2, on2 + on3
+                elif field == "triples":
+                    nb, r = 4, on1 + on2 + on3
+                elif field == "hr":
+                    nb, r = 0, on1 + on2 + on3 + 1
+                elif field in ("bb", "hbp"):
+                    if not on1:
+                        nb = b | 1
+                    elif not on2:
+                        nb = b | 3
+                    else:
+                        nb, r = 7, on3
+                elif field == "sf" and on3 and outs < 2:
+                    nb, r = b & 3, 1
+                next_bases[o, b, outs], runs[o, b, outs] = nb, r
+        outs_added[o] = field in ("so", "sf", "other_outs")
+    return next_bases, runs, outs_added
+
+NEXT_BASES, RUNS, OUTS_ADDED = _transitions()
+
+def league_rates(batting: dict[int, Counters]) -> np.ndarray:
+    totals = np.array([sum(c[f] for c in batting.values()) for f in OUTCOMES], float)
+    if totals.sum() == 0:
+        totals = np.array([DEFAULT_RATES[f] for f in OUTCOMES])
+    return totals / totals.sum()
+
+def outcome_rates(c: Counters | None, league: np.ndarray, prior: float = SIM_PRIOR_PA) -> np.ndarray:
+    """A player's outcome probabilities, shrunk toward the league by `prior` pseudo-PAs."""
+    counts = np.array([c[f] for f in OUTCOMES], float) if c else np.zeros(N_OUTCOMES)
+    return (counts + prior * league) / (counts.sum() + prior)
+
+@dataclass(frozen=True)
+class GameSpec:
+    """Everything a worker needs to play one game forward, as plain arrays."""
+    game_id: int
+    home_team_id: int
+    away_team_id: int
+    home_cum: np.ndarray  # (9, N_OUTCOMES) cumulative outcome probabilities by lineup slot
+    away_cum: np.ndarray
+    inning: int = 1
+    half: int = 0         # 0 = top, 1 = bottom
+    outs: int = 0
+    home_runs: int = 0
+    away_runs: int = 0
+    home_next: int = 0    # lineup slot due up
+    away_next: int = 0
+
+def _inverse_cdf(cum: np.ndarray) -> np.ndarray:
+    """Per row, the outcome a draw starting each of LUT_BINS equal bins can't be below."""
+    starts = np.arange(LUT_BINS) / LUT_BINS
+    lut = np.stack([np.searchsorted(row, starts, side="left") for row in cum])
+    return np.minimum(lut, N_OUTCOMES - 1).astype(np.int8)
+
+def _draw(u: np.ndarray, rows: np.ndarray, cum: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    """Outcome index for uniform draws `u`: the first outcome whose cumulative probability reaches u.
+
+    The table lookup is exact except in bins that straddle a boundary, which a few
+    cheap single-column comparisons fix up.
+    """
+    o = lut[rows, (u * LUT_BINS).astype(np.intp)].astype(np.intp)
+    last = N_OUTCOMES - 1
+    while True:
+        step = (o < last) & (u > cum[rows, np.minimum(o, last)])
+        if not step.any():
+            return o
+        o += step
+
+def simulate_games(specs: list[GameSpec], n: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Play `n` copies of every game from its start state; returns (home runs, away runs), each (n, games).
+
+    All copies of all games advance together one PA per step, so the Python loop runs about
+    as many times as the longest game has PAs. State is kept only for unfinished copies and
+    compacted as they finish. Bases start empty.
+    """
+    n_games = len(specs)
+    # Row (game * 2 + side) * 9 + slot holds that hitter's cumulative outcome probabilities
+    cum = np.stack([np.stack([s.away_cum, s.home_cum]) for s in specs]).reshape(-1, N_OUTCOMES)
+    lut = _inverse_cdf(cum)
+    start = lambda attr, dtype: np.tile(np.array([getattr(s, attr) for s in specs], dtype), n)
+    idx = np.arange(n * n_games)
+    game = idx % n_games
+    inning, half, outs = start("inning", np.int16), start("half", np.int8), start("outs", np.int8)
+    away, home = start("away_runs", np.int32), start("home_runs", np.int32)
+    away_next, home_next = start("away_next", np.int8), start("home_next", np.int8)
+    bases = np.zeros(idx.size, np.int8)
+    final_home, final_away = home.copy(), away.copy()
+
+    # Home already ahead going into the bottom of the 9th or later: nothing left to play
+    over = (half == 1) & (inning >= 9) & (home > away)
+    for _ in range(MAX_GAME_PA):
+        if over.any():
+            final_home[idx[over]], final_away[idx[over]] = home[over], away[over]
+            keep = ~over
+            idx, game, inning, half, outs, bases, away, home, away_next, home_next = (
+                a[keep] for a in (idx, game, inning, half, outs, bases, away, home, away_next, home_next)
+            )
+        if not idx.size:
+            break
+        bottom = half == 1
+        slot = np.where(bottom, home_next, away_next)
+        o = _draw(rng.random(idx.size), (game * 2 + half) * 9 + slot, cum, lut)
+        r = RUNS[o, bases, outs]
+        home += np.where(bottom, r, 0)
+        away += np.where(bottom, 0, r)
+        bases = NEXT_BASES[o, bases, outs]
+        outs = outs + OUTS_ADDED[o]
+        up = (slot + 1) % 9
+        home_next = np.where(bottom, up, home_next)
+        away_next = np.where(bottom, away_next, up)
+
+        side_over = outs >= 3
+        late = inning >= 9
+        over = bottom & late & (home > away)                        # walk-off
+        over |= side_over & ~bottom & late & (home > away)          # bottom half not needed
+        over |= side_over & bottom & late & (home != away)          # decided after a full inning
+        over |= side_over & bottom & (inning >= MAX_INNINGS)        # called a tie
+        turn = side_over & ~over
+        outs[turn], bases[turn] = 0, 0
+        half = np.where(turn, half ^ 1, half).astype(np.int8)
+        inning += turn & (half == 0)
+    final_home[idx], final_away[idx] = home, away  # cut off by MAX_GAME_PA
+    return final_home.reshape(n, n_games), final_away.reshape(n, n_games)
+
+def simulate_game(spec: GameSpec, n: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Play `n` copies of one game; returns (home runs, away runs)."""
+    home, away = simulate_games([spec], n, rng)
+    return home[:, 0], away[:, 0]
+
+def _game_chunk(spec: GameSpec, n: int, seed: np.random.SeedSequence) -> tuple[np.ndarray, np.ndarray]:
+    return simulate_game(spec, n, np.random.default_rng(seed))
+
+def _season_chunk(schedule: tuple[list[GameSpec], np.ndarray, np.ndarray, int], n: int,
+                  seed: np.random.SeedSequence) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(wins, losses, ties), each (n, n_teams), over `specs` with home/away team positions."""
+    specs, home_pos, away_pos, n_teams = schedule
+    rng = np.random.default_rng(seed)
+    wins, losses, ties = (np.zeros((n, n_teams), np.int32) for _ in range(3))
+    # Blocks of games bound the per-step working set on long schedules; each block's
+    # results are folded into team totals right away so nothing grows with the schedule
+    for i in range(0, len(specs), GAME_BLOCK):
+        block = specs[i:i + GAME_BLOCK]
+        home_runs, away_runs = simulate_games(block, n, rng)
+        home = np.zeros((len(block), n_teams), np.float32)
+        away = np.zeros((len(block), n_teams), np.float32)
+        home[np.arange(len(block)), home_pos[i:i + GAME_BLOCK]] = 1
+        away[np.arange(len(block)), away_pos[i:i + GAME_BLOCK]] = 1
+        home_win = (home_runs > away_runs).astype(np.float32)
+        away_win = (home_runs < away_runs).astype(np.float32)
+        tie = (home_runs == away_runs).astype(np.float32)
+        wins += (home_win @ home + away_win @ away).astype(np.int32)
+        losses += (away_win @ home + home_win @ away).astype(np.int32)
+        ties += (tie @ (home + away)).astype(np.int32)
+    return wins, losses, ties
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+def executor() -> ProcessPoolExecutor | None:
+    global _executor
+    if SIM_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # Never fork: the server has live threads (job coordinator, cache listener, DB pool)
+            _executor = ProcessPoolExecutor(max_workers=SIM_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
+def _run_chunks(fn, arg, n_sims: int, seed: int) -> list:
+    """Split `n_sims` into SIM_CHUNK tasks with independent child seeds and run them."""
+    sizes = [min(SIM_CHUNK, n_sims - i) for i in range(0, n_sims, SIM_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    pool = executor()
+    if pool is None:
+        return [fn(arg, n, s) for n, s in zip(sizes, seeds)]
+    futures = [pool.submit(fn, arg, n, s) for n, s in zip(sizes, seeds)]
+    return [f.result() for f in futures]
+
+# ---- Building specs from the database ----
+
+def _cum_table(player_ids: list[int], batting: dict[int, Counters], league: np.ndarray) -> np.ndarray:
+    rows = [outcome_rates(batting.get(pid), league) for pid in player_ids[:9]]
+    rows += [league] * (9 - len(rows))  # short lineups are filled with league-average hitters
+    return np.cumsum(rows, axis=1)
+
+def _default_orders(db: Session, team_ids, batting: dict[int, Counters]) -> dict[int, list[int]]:
+    """Without a posted lineup, a team's nine most-used hitters, most PAs first."""
+    by_team: dict[int, list[int]] = {}
+    for pid, team_id in db.query(Player.id, Player.team_id).filter(Player.team_id.in_(list(team_ids))):
+        by_team.setdefault(team_id, []).append(pid)
+    pa = lambda pid: sum(batting[pid][f] for f in OUTCOMES) if pid in batting else 0
+    return {t: sorted(ids, key=pa, reverse=True)[:9] for t, ids in by_team.items()}
+
+def _live_state(db: Session, game: Game) -> dict:
+    """Where a live game stands: half-inning, outs, score and who is due up.
+
+    Bases are not tracked, so the current half resumes with them empty.
+    """
+    rows = (
+        db.query(PlateAppearance.inning, PlateAppearance.half, PlateAppearance.result)
+          .filter(PlateAppearance.game_id == game.id)
+          .order_by(PlateAppearance.id)
+          .all()
+    )
+    state = {"inning": 1, "half": 0, "outs": 0, "home_runs": game.home_score or 0,
+             "away_runs": game.away_score or 0, "home_next": 0, "away_next": 0}
+    if not rows:
+        return state
+    field = {r: OUTCOMES.index(f) for r, f in RESULT_FIELDS.items()}
+    appearances = {0: 0, 1: 0}
+    for _, half, _ in rows:
+        appearances[half == HalfInning.bottom] += 1
+    inning, half = rows[-1].inning, int(rows[-1].half == HalfInning.bottom)
+    outs = sum(int(OUTS_ADDED[field[r]]) for i, h, r in rows if i == inning and int(h == HalfInning.bottom) == half)
+    if outs >= 3:
+        outs, half = 0, half ^ 1
+        inning += half == 0
+    state.update(inning=inning, half=half, outs=outs,
+                 away_next=appearances[0] % 9, home_next=appearances[1] % 9)
+    return state
+
+def build_specs(db: Session, season_id: int, games: list[Game]) -> list[GameSpec]:
+    batting, _ = _season_counters(db, season_id)
+    league = league_rates(batting)
+    posted = current_orders(db, [g.id for g in games])
+    defaults = _default_orders(db, {t for g in games for t in (g.home_team_id, g.away_team_id)}, batting)
+
+    def order(game: Game, team_id: int) -> list[int]:
+        return posted.get((game.id, team_id)) or defaults.get(team_id, [])
+
+    return [
+        GameSpec(
+            game_id=g.id, home_team_id=g.home_team_id, away_team_id=g.away_team_id,
+            home_cum=_cum_table(order(g, g.home_team_id), batting, league),
+            away_cum=_cum_table(order(g, g.away_team_id), batting, league),
+            **_live_state(db, g),
+        )
+        for g in games
+    ]
+
+# ---- Entry points ----
+
+def simulate_game_odds(db: Session, game: Game, n_sims: int, seed: int) -> dict:
+    """Win probabilities for a live game, played forward from its current state."""
+    spec = build_specs(db, game.season_id, [game])[0]
+    chunks = _run_chunks(_game_chunk, spec, n_sims, seed)
+    home = np.concatenate([h for h, _ in chunks])
+    away = np.concatenate([a for _, a in chunks])
+    return {
+        "game_id": game.id,
+        "n_sims": n_sims,
+        "seed": seed,
+        "home_win_prob": round(float(np.mean(home > away)), 4),
+        "away_win_prob": round(float(np.mean(away > home)), 4),
+        "tie_prob": round(float(np.mean(home == away)), 4),
+        "home_runs_mean": round(float(home.mean()), 2),
+        "away_runs_mean": round(float(away.mean()), 2),
+        "start": {k: getattr(spec, k) for k in ("inning", "half", "outs", "home_runs", "away_runs")},
+    }
+
+def simulate_season(db: Session, season_id: int, n_sims: int, seed: int, playoff_teams: int | None = None) -> dict:
+    """Play out every game that isn't final; projected records and playoff odds per team.
+
+    Playoff spots go to the best `playoff_teams` records (ties broken at random).
+    """
+    teams = db.query(Team).filter(Team.season_id == season_id).order_by(Team.id).all()
+    pos = {t.id: i for i, t in enumerate(teams)}
+    records = {r.team_id: r for r in db.query(TeamRecord).filter(TeamRecord.season_id == season_id)}
+    games = (
+        db.query(Game)
+          .filter(Game.season_id == season_id, Game.status != GameStatus.final)
+          .order_by(Game.id)
+          .all()
+    )
+    specs = build_specs(db, season_id, games)
+    n_teams = len(teams)
+    playoff_teams = max(0, min(playoff_teams or SIM_PLAYOFF_TEAMS, n_teams))
+
+    base = np.array([[getattr(records.get(t.id), f, 0) or 0 for f in ("wins", "losses", "ties")] for t in teams], float)
+    wins, losses, ties = (np.tile(base[:, k], (n_sims, 1)) for k in range(3))
+    if specs:
+        home_pos = np.array([pos[s.home_team_id] for s in specs], np.intp)
+        away_pos = np.array([pos[s.away_team_id] for s in specs], np.intp)
+        chunks = _run_chunks(_season_chunk, (specs, home_pos, away_pos, n_teams), n_sims, seed)
+        wins += np.concatenate([c[0] for c in chunks])
+        losses += np.concatenate([c[1] for c in chunks])
+        ties += np.concatenate([c[2] for c in chunks])
+
+    # Rank each simulated season by win percentage with a random tiebreak
+    played = np.maximum(wins + losses + ties, 1)
+    score = (wins + 0.5 * ties) / played
+    # The root seed's stream is independent of the chunks' spawned child streams
+    jitter = np.random.default_rng(seed).random(score.shape)
+    order = np.lexsort((jitter, -score), axis=1) if n_teams else np.empty((n_sims, 0), int)
+    made = np.zeros(score.shape, bool)
+    np.put_along_axis(made, order[:, :playoff_teams], True, axis=1)
+    first = np.bincount(order[:, 0], minlength=n_teams) if n_teams else np.zeros(0)
+
+    return {
+        "season_id": season_id,
+        "n_sims": n_sims,
+        "seed": seed,
+        "games_simulated": len(specs),
+        "playoff_teams": playoff_teams,
+        "teams": sorted(
+            (
+                {
+                    "team_id": t.id,
+                    "name": t.name,
+                    "wins": int(base[i, 0]),
+                    "losses": int(base[i, 1]),
+                    "ties": int(base[i, 2]),
+                    "proj_wins": round(float(wins[:, i].mean()), 2),
+                    "proj_losses": round(float(losses[:, i].mean()), 2),
+                    "playoff_odds": round(float(made[:, i].mean()), 4),
+                    "first_place_odds": round(float(first[i] / n_sims), 4),
+                }
+                for i, t in enumerate(teams)
+            ),
+            key=lambda row: (-row["playoff_odds"], -row["proj_wins"]),
+        ),
+    }
@@ -0,0 +1,153 @@
+from __future__ import annotations
+import logging
+import os
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..models import PlateAppearance, GameStatSnapshot
+from .counters import Counters, fold, encode, decode, prune
+
+log = logging.getLogger(__name__)
+
+# Take a snapshot once this many events have accumulated past the latest one
+SNAPSHOT_INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", "50"))
+# When enabled, every snapshot+tail read is checked against a full replay
+SNAPSHOT_VERIFY = os.getenv("SNAPSHOT_VERIFY", "0") == "1"
+
+GameCounters = tuple[dict[int, Counters], dict[int, Counters]]
+
+def _event_rows(db: Session, game_id: int, after_seq: int = 0):
+    # PA ids are the event sequence numbers within a game
+    return (
+        db.query(
+            PlateAppearance.id,
+            PlateAppearance.batter_id,
+            PlateAppearance.pitcher_id,
+            PlateAppearance.result,
+            PlateAppearance.rbis,
+        )
+        .filter(PlateAppearance.game_id == game_id, PlateAppearance.id > after_seq)
+        .order_by(PlateAppearance.id)
+        .all()
+    )
+
+def latest_snapshot(db: Session, game_id: int) -> GameStatSnapshot | None:
+    return (
+        db.query(GameStatSnapshot)
+          .filter(GameStatSnapshot.game_id == game_id)
+          .order_by(GameStatSnapshot.through_pa_id.desc())
+          .first()
+    )
+
+def _start_from(snap: GameStatSnapshot | None) -> tuple[dict[int, Counters], dict[int, Counters], int, int]:
+    if snap is None:
+        return {}, {}, 0, 0
+    return decode(snap.batting), decode(snap.pitching), snap.through_pa_id, snap.event_count
+
+def replay_game(db: Session, game_id: int) -> GameCounters:
+    batting, pitching = {}, {}
+    fold(batting, pitching, (r[1:] for r in _event_rows(db, game_id)))
+    return batting, pitching
+
+def load_game_counters(db: Session, game_id: int) -> GameCounters:
+    """Latest snapshot plus the events recorded after it."""
+    snap = latest_snapshot(db, game_id)
+    batting, pitching, seq, _ = _start_from(snap)
+    fold(batting, pitching, (r[1:] for r in _event_rows(db, game_id, seq)))
+
+    if SNAPSHOT_VERIFY and snap is not None:
+        full = replay_game(db, game_id)
+        if full != (batting, pitching):
+            log.warning("Snapshot %s for game %s diverges from full replay", snap.through_pa_id, game_id)
+            return full
+    return batting, pitching
+
+def maybe_snapshot(db: Session, game_id: int, interval: int | None = None) -> GameStatSnapshot | None:
+    """Add a snapshot if at least `interval` events follow the latest one. Caller commits."""
+    interval = interval or SNAPSHOT_INTERVAL
+    snap = latest_snapshot(db, game_id)
+    seq = snap.through_pa_id if snap else 0
+    pending = (
+        db.query(func.count(PlateAppearance.id))
+          .filter(PlateAppearance.game_id == game_id, PlateAppearance.id > seq)
+          .scalar()
+    )
+    if pending < interval:
+        return None
+
+    batting, pitching, seq, count = _start_from(snap)
+    rows = _event_rows(db, game_id, seq)
+    count += fold(batting, pitching, (r[1:] for r in rows))
+    new = GameStatSnapshot(
+        game_id=game_id, through_pa_id=rows[-1].id, event_count=count,
+        batting=encode(batting), pitching=encode(pitching),
+    )
+    db.add(new)
+    return new
+
+def rebuild_snapshots(db: Session, game_id: int, from_seq: int, interval: int | None = None) -> int:
+    """Drop snapshots that cover event `from_seq` and re-take them from the last valid one.
+
+    Call after an event at or before `from_seq` has been corrected. Caller commits.
+    Returns the number of snapshots written.
+    """
+    interval = interval or SNAPSHOT_INTERVAL
+    (
+        db.query(GameStatSnapshot)
+          .filter(GameStatSnapshot.game_id == game_id, GameStatSnapshot.through_pa_id >= from_seq)
+          .delete(synchronize_session=False)
+    )
+    batting, pitching, seq, count = _start_from(latest_snapshot(db, game_id))
+    rows = _event_rows(db, game_id, seq)
+
+    written = 0
+    for end in range(interval, len(rows) + 1, interval):
+        chunk = rows[end - interval:end]
+        count += fold(batting, pitching, (r[1:] for r in chunk))
+        db.add(GameStatSnapshot(
+            game_id=game_id, through_pa_id=chunk[-1].id, event_count=count,
+            batting=encode(batting), pitching=encode(pitching),
+        ))
+        written += 1
+    return written
+
+def apply_correction(db: Session, game_id: int, seq: int, old: tuple, new: tuple | None) -> int:
+    """Patch snapshots that already folded event `seq`: subtract `old`, add `new` (None = deleted).
+
+    Events are (batter_id, pitcher_id, result, rbis). Caller commits. Returns snapshots patched.
+    """
+    snaps = (
+        db.query(GameStatSnapshot)
+          .filter(GameStatSnapshot.game_id == game_id, GameStatSnapshot.through_pa_id >= seq)
+          .all()
+    )
+    for snap in snaps:
+        batting, pitching = decode(snap.batting), decode(snap.pitching)
+        fold(batting, pitching, [old], sign=-1)
+        if new is not None:
+            fold(batting, pitching, [new])
+        else:
+            snap.event_count -= 1
+        # Reassign: JSON columns don't track in-place mutation
+        snap.batting = encode(prune(batting))
+        snap.pitching = encode(prune(pitching))
+    return len(snaps)
+
+def verify_snapshot(db: Session, game_id: int) -> dict:
+    """Compare snapshot+tail counters with a full replay of the game's events."""
+    snap = latest_snapshot(db, game_id)
+    batting, pitching, seq, _ = _start_from(snap)
+    fold(batting, pitching, (r[1:] for r in _event_rows(db, game_id, seq)))
+    full_batting, full_pitching = replay_game(db, game_id)
+
+    def _diff(a: dict[int, Counters], b: dict[int, Counters]) -> list[int]:
+        return sorted(pid for pid in a.keys() | b.keys() if a.get(pid) != b.get(pid))
+
+    batting_diff = _diff(batting, full_batting)
+    pitching_diff = _diff(pitching, full_pitching)
+    return {
+        "game_id": game_id,
+        "snapshot_seq": seq,
+        "ok": not batting_diff and not pitching_diff,
+        "batting_mismatches": batting_diff,
+        "pitching_mismatches": pitching_diff,
+    }
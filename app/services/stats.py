@@ -1,115 +1,191 @@
 from __future__ import annotations
-from sqlalchemy.orm import Session
-from collections import defaultdict
-from ..models import PlateAppearance, PAResult, Player, Game
-from ..schemas import PlayerStats, BoxScore
-from typing import Literal, List
+from sqlalchemy.orm import Session, aliased
+from ..models import (
+    PlateAppearance, Player, Game, MatchupCounter, Person, PlayerSeasonRollup, Team, TeamCounter, TeamRecord,
+)
+from ..schemas import (
+    PlayerStats, BoxScore, PitcherStats, GamePitching, LeagueConstants, MatchupStats,
+    BattingLine, PitchingLine, TeamStats, StandingsRow, Career, CareerMatchup, CareerSeason,
+)
+from .aggregates import counters_from_row
+from . import archive
+from .cache import stats_cache
+from .counters import COUNTER_FIELDS, Counters, fold, new_counters
+from .snapshots import load_game_counters
+from typing import Iterable, Literal, List
 
-Metric = Literal["avg", "obp", "slg", "ops"]
+Metric = Literal["avg", "obp", "slg", "ops", "iso", "babip", "woba", "ops_plus", "k_pct", "bb_pct"]
+PitchingMetric = Literal["era", "fip", "k_pct", "bb_pct"]
+# The one list of rankable metrics: leaderboards, their query validation and percentiles
+BATTING_METRICS: tuple[str, ...] = Metric.__args__
+PITCHING_METRICS: tuple[str, ...] = PitchingMetric.__args__
+# Batting rate stats where a lower value ranks higher
+BATTING_LOWER_IS_BETTER = frozenset({"k_pct"})
+
+# wOBA linear weights (typical MLB values; we don't track IBB or reached-on-error)
+WOBA_WEIGHTS = {"bb": 0.69, "hbp": 0.72, "singles": 0.89, "doubles": 1.27, "triples": 1.62, "hr": 2.10}
 
 def _safe_div(n: int, d: int) -> float:
     return round((n / d) if d else 0.0, 3)
 
-def compute_boxscore(db: Session, game_id: int) -> BoxScore:
-    q = (
-        db.query(PlateAppearance, Player)
-        .join(Player, Player.id == PlateAppearance.batter_id)
-        .filter(PlateAppearance.game_id == game_id)
-        .all()
+def _players_by_id(db: Session, ids) -> dict[int, Player]:
+    ids = list(ids)
+    if not ids:
+        return {}
+    return {p.id: p for p in db.query(Player).filter(Player.id.in_(ids)).all()}
+
+def _sum_counters(counters: Iterable[Counters]) -> Counters:
+    total = new_counters()
+    for c in counters:
+        for k in COUNTER_FIELDS:
+            total[k] += c[k]
+    return total
+
+def _hits(c: Counters) -> int:
+    return c["singles"] + c["doubles"] + c["triples"] + c["hr"]
+
+def _at_bats(c: Counters) -> int:
+    return _hits(c) + c["so"] + c["other_outs"]
+
+def _total_bases(c: Counters) -> int:
+    return c["singles"] + 2 * c["doubles"] + 3 * c["triples"] + 4 * c["hr"]
+
+def _outs(c: Counters) -> int:
+    # Outs recorded while a pitcher is in: K, OUT, SF
+    return c["so"] + c["other_outs"] + c["sf"]
+
+def _woba(c: Counters) -> float:
+    num = sum(w * c[k] for k, w in WOBA_WEIGHTS.items())
+    return _safe_div(num, _at_bats(c) + c["bb"] + c["hbp"] + c["sf"])
+
+def _fip_core(c: Counters) -> float:
+    ip = _outs(c) / 3.0
+    return (13 * c["hr"] + 3 * (c["bb"] + c["hbp"]) - 2 * c["so"]) / ip if ip else 0.0
+
+def _league_constants(season_id: int, batting: dict[int, Counters], pitching: dict[int, Counters]) -> LeagueConstants:
+    b = _sum_counters(batting.values())
+    p = _sum_counters(pitching.values())
+    ab, h = _at_bats(b), _hits(b)
+    pa = ab + b["bb"] + b["hbp"] + b["sf"]
+    era = _era_approx(p["rbi"], _outs(p))
+    return LeagueConstants(
+        season_id=season_id,
+        pa=pa,
+        obp=_safe_div(h + b["bb"] + b["hbp"], pa),
+        slg=_safe_div(_total_bases(b), ab),
+        woba=_woba(b),
+        era=era,
+        k_pct=_safe_div(b["so"], pa),
+        bb_pct=_safe_div(b["bb"], pa),
+        # FIP constant puts league FIP on the ERA scale
+        fip_constant=round(era - _fip_core(p), 2) if _outs(p) else 0.0,
     )
 
-    stat = defaultdict(lambda: dict(ab=0, h=0, bb=0, hbp=0, sf=0, tb=0, first_name="", last_name=""))
-    for pa, player in q:
-        s = stat[player.id]
-        s["first_name"] = player.first_name
-        s["last_name"] = player.last_name
-        res = pa.result
-        if res in (PAResult.SINGLE, PAResult.DOUBLE, PAResult.TRIPLE, PAResult.HOMERUN, PAResult.OUT, PAResult.STRIKEOUT):
-            s["ab"] += 1
-        if res == PAResult.SINGLE:
-            s["h"] += 1; s["tb"] += 1
-        elif res == PAResult.DOUBLE:
-            s["h"] += 1; s["tb"] += 2
-        elif res == PAResult.TRIPLE:
-            s["h"] += 1; s["tb"] += 3
-        elif res == PAResult.HOMERUN:
-            s["h"] += 1; s["tb"] += 4
-        elif res == PAResult.WALK:
-            s["bb"] += 1
-        elif res == PAResult.HBP:
-            s["hbp"] += 1
-        elif res == PAResult.SAC_FLY:
-            s["sf"] += 1
-
-    batting = []
-    for pid, s in stat.items():
-        ab, h, bb, hbp, sf, tb = s["ab"], s["h"], s["bb"], s["hbp"], s["sf"], s["tb"]
-        avg = _safe_div(h, ab)
-        obp = _safe_div(h + bb + hbp, ab + bb + hbp + sf)
-        slg = _safe_div(tb, ab)
-        ops = round(obp + slg, 3)
-        batting.append(
-            PlayerStats(
-                player_id=pid,
-                first_name=s["first_name"],
-                last_name=s["last_name"],
-                ab=ab, h=h, bb=bb, hbp=hbp, sf=sf, tb=tb,
-                avg=avg, obp=obp, slg=slg, ops=ops
-            )
-        )
+def _batting_values(c: Counters, league: LeagueConstants | None = None) -> dict:
+    h = _hits(c)
+    ab = _at_bats(c)
+    bb, hbp, sf, so, hr = c["bb"], c["hbp"], c["sf"], c["so"], c["hr"]
+    pa = ab + bb + hbp + sf
+    tb = _total_bases(c)
+    avg = _safe_div(h, ab)
+    obp = _safe_div(h + bb + hbp, pa)
+    slg = _safe_div(tb, ab)
+    ops = round(obp + slg, 3)
+    ops_plus = None
+    if league is not None and league.obp and league.slg:
+        ops_plus = round(100 * (obp / league.obp + slg / league.slg - 1))
+    return dict(
+        ab=ab, h=h, bb=bb, hbp=hbp, sf=sf, tb=tb,
+        avg=avg, obp=obp, slg=slg, ops=ops,
+        pa=pa, doubles=c["doubles"], triples=c["triples"], hr=hr, so=so,
+        iso=_safe_div(tb - h, ab),
+        babip=_safe_div(h - hr, ab - so - hr + sf),
+        k_pct=_safe_div(so, pa),
+        bb_pct=_safe_div(bb, pa),
+        woba=_woba(c),
+        ops_plus=ops_plus,
+    )
+
+def _batting_line(player: Player, c: Counters, league: LeagueConstants | None = None) -> PlayerStats:
+    return PlayerStats(
+        player_id=player.id, first_name=player.first_name, last_name=player.last_name,
+        **_batting_values(c, league),
+    )
+
+def compute_matchup(db: Session, batter_id: int, pitcher_id: int) -> MatchupStats | None:
+    row = db.get(MatchupCounter, (batter_id, pitcher_id))
+    players = _players_by_id(db, (batter_id, pitcher_id))
+    if batter_id not in players or pitcher_id not in players:
+        return None
+    c = counters_from_row(row) if row is not None else new_counters()
+    return _matchup_line(players[pitcher_id], players[batter_id], c)
 
+def _matchup_line(pitcher: Player, batter: Player, c: Counters) -> MatchupStats:
+    return MatchupStats(
+        batter_id=batter.id, pitcher_id=pitcher.id,
+        pitcher_first_name=pitcher.first_name, pitcher_last_name=pitcher.last_name,
+        batting=_batting_line(batter, c),
+    )
+
+def compute_pitcher_matchups(
+    db: Session,
+    pitcher_id: int,
+    sort: Literal["pa", "ops", "avg", "hr", "so"] = "pa",
+    min_pa: int = 1,
+    limit: int = 10,
+) -> list[MatchupStats]:
+    """Best batter lines against one pitcher, from the matchup counter table."""
+    rows = db.query(MatchupCounter).filter(MatchupCounter.pitcher_id == pitcher_id).all()
+    players = _players_by_id(db, [pitcher_id] + [r.batter_id for r in rows])
+    pitcher = players.get(pitcher_id)
+    if pitcher is None:
+        return []
+    lines = [_matchup_line(pitcher, players[r.batter_id], counters_from_row(r)) for r in rows if r.batter_id in players]
+    lines = [m for m in lines if m.batting.pa >= min_pa]
+    lines.sort(key=lambda m: (getattr(m.batting, sort), m.batting.pa), reverse=True)
+    return lines[: max(0, limit)]
+
+def compute_boxscore(db: Session, game_id: int) -> BoxScore:
+    # Game-scoped only: OPS+ needs season league constants, which change with every PA
+    batting_counters, _ = load_game_counters(db, game_id)
+    players = _players_by_id(db, batting_counters)
+    batting = [_batting_line(players[pid], c) for pid, c in batting_counters.items() if pid in players]
     return BoxScore(game_id=game_id, batting=batting)
 
-def compute_season_stats(db: Session, season_id: int) -> list[PlayerStats]:
-    # Join PlateAppearance -> Player -> Game and filter by season
+def _season_counters(db: Session, season_id: int) -> tuple[dict[int, Counters], dict[int, Counters]]:
+    archived = archive.open_season(season_id)
+    if archived is not None:
+        return archive.season_counters(archived)
     rows = (
-        db.query(PlateAppearance, Player)
-          .join(Player, Player.id == PlateAppearance.batter_id)
+        db.query(PlateAppearance.batter_id, PlateAppearance.pitcher_id, PlateAppearance.result, PlateAppearance.rbis)
           .join(Game, Game.id == PlateAppearance.game_id)
           .filter(Game.season_id == season_id)
           .all()
     )
+    batting, pitching = {}, {}
+    fold(batting, pitching, rows)
+    return batting, pitching
 
-    stat = defaultdict(lambda: dict(ab=0, h=0, bb=0, hbp=0, sf=0, tb=0, first_name="", last_name=""))
-    for pa, player in rows:
-        s = stat[player.id]
-        s["first_name"] = player.first_name
-        s["last_name"] = player.last_name
-        res = pa.result
-        if res in (PAResult.SINGLE, PAResult.DOUBLE, PAResult.TRIPLE, PAResult.HOMERUN, PAResult.OUT, PAResult.STRIKEOUT):
-            s["ab"] += 1
-        if res == PAResult.SINGLE:
-            s["h"] += 1; s["tb"] += 1
-        elif res == PAResult.DOUBLE:
-            s["h"] += 1; s["tb"] += 2
-        elif res == PAResult.TRIPLE:
-            s["h"] += 1; s["tb"] += 3
-        elif res == PAResult.HOMERUN:
-            s["h"] += 1; s["tb"] += 4
-        elif res == PAResult.WALK:
-            s["bb"] += 1
-        elif res == PAResult.HBP:
-            s["hbp"] += 1
-        elif res == PAResult.SAC_FLY:
-            s["sf"] += 1
-
-    results: list[PlayerStats] = []
-    for pid, s in stat.items():
-        ab, h, bb, hbp, sf, tb = s["ab"], s["h"], s["bb"], s["hbp"], s["sf"], s["tb"]
-        avg = _safe_div(h, ab)
-        obp = _safe_div(h + bb + hbp, ab + bb + hbp + sf)
-        slg = _safe_div(tb, ab)
-        ops = round(obp + slg, 3)
-        results.append(
-            PlayerStats(
-                player_id=pid,
-                first_name=s["first_name"],
-                last_name=s["last_name"],
-                ab=ab, h=h, bb=bb, hbp=hbp, sf=sf, tb=tb,
-                avg=avg, obp=obp, slg=slg, ops=ops,
-            )
-        )
-    return results
+def _season_players(db: Session, season_id: int, ids) -> dict:
+    archived = archive.open_season(season_id)
+    if archived is not None:
+        found = {pid: archived.player(pid) for pid in ids}
+        return {pid: p for pid, p in found.items() if p is not None}
+    return _players_by_id(db, ids)
+
+def compute_league_constants(db: Session, season_id: int) -> LeagueConstants:
+    return _league_constants(season_id, *_season_counters(db, season_id))
+
+def league_constants(db: Session, season_id: int) -> LeagueConstants:
+    """League constants for the season, computed once per season cache version."""
+    return stats_cache.get_or_compute("season", season_id, "league", lambda: compute_league_constants(db, season_id))
+
+def compute_season_stats(db: Session, season_id: int) -> list[PlayerStats]:
+    batting, pitching = _season_counters(db, season_id)
+    # League totals fall out of the same aggregation
+    league = _league_constants(season_id, batting, pitching)
+    players = _season_players(db, season_id, batting)
+    return [_batting_line(players[pid], c, league) for pid, c in batting.items() if pid in players]
 
 def compute_season_leaderboard(
     db: Session,
@@ -131,7 +207,13 @@ def compute_season_leaderboard(
         "slg": lambda s: (s.slg, s.tb, s.h, s.ab),
         "ops": lambda s: (s.ops, s.slg, s.obp, s.ab),
     }
-    key_fn = key_map.get(metric, key_map["ops"])
+    if metric in key_map:
+        key_fn = key_map[metric]
+    elif metric in BATTING_METRICS:
+        sign = -1 if metric in BATTING_LOWER_IS_BETTER else 1
+        key_fn = lambda s: (sign * (getattr(s, metric) or 0), s.pa)
+    else:
+        key_fn = key_map["ops"]
     stats.sort(key=key_fn, reverse=True)
 
     return stats[: max(0, limit)]
@@ -144,117 +226,45 @@ def _era_approx(ra: int, outs: int) -> float:
     ip = outs / 3.0
     return round((9.0 * ra / ip) if ip > 0 else 0.0, 2)
 
-def compute_game_pitching(db: Session, game_id: int) -> GamePitching:
-    rows = (
-        db.query(PlateAppearance, Player)
-          .join(Player, Player.id == PlateAppearance.pitcher_id)
-          .filter(PlateAppearance.game_id == game_id, PlateAppearance.pitcher_id.isnot(None))
-          .all()
+def _pitching_values(c: Counters, league: LeagueConstants | None = None) -> dict:
+    h = _hits(c)
+    ab = _at_bats(c)
+    outs = _outs(c)
+    bf = ab + c["bb"] + c["hbp"] + c["sf"]
+    # Runs allowed proxy (sum RBIs)
+    ra = c["rbi"]
+    fip = round(_fip_core(c) + league.fip_constant, 2) if league is not None and outs else None
+    return dict(
+        bf=bf, ab=ab, h=h, bb=c["bb"], hbp=c["hbp"], so=c["so"], hr=c["hr"], sf=c["sf"],
+        outs=outs, ip=_outs_to_ip_str(outs), ra=ra, era=_era_approx(ra, outs),
+        k_pct=_safe_div(c["so"], bf), bb_pct=_safe_div(c["bb"], bf), fip=fip,
     )
 
-    agg = {}
-    for pa, pitcher in rows:
-        pid = pitcher.id
-        s = agg.setdefault(pid, {
-            "first": pitcher.first_name, "last": pitcher.last_name,
-            "bf": 0, "ab": 0, "h": 0, "bb": 0, "hbp": 0, "so": 0, "hr": 0, "sf": 0, "outs": 0, "ra": 0
-        })
-        s["bf"] += 1
-
-        r = pa.result
-        # AB, hits, HR
-        if r in (PAResult.SINGLE, PAResult.DOUBLE, PAResult.TRIPLE, PAResult.HOMERUN, PAResult.OUT, PAResult.STRIKEOUT):
-            s["ab"] += 1
-        if r in (PAResult.SINGLE, PAResult.DOUBLE, PAResult.TRIPLE, PAResult.HOMERUN):
-            s["h"] += 1
-        if r == PAResult.HOMERUN:
-            s["hr"] += 1
-
-        # Walk / HBP
-        if r == PAResult.WALK:
-            s["bb"] += 1
-        if r == PAResult.HBP:
-            s["hbp"] += 1
-
-        # Outs recorded while this pitcher is in:
-        # count K, OUT, SF as outs
-        if r in (PAResult.STRIKEOUT, PAResult.OUT, PAResult.SAC_FLY):
-            s["outs"] += 1
-        if r == PAResult.STRIKEOUT:
-            s["so"] += 1
-        if r == PAResult.SAC_FLY:
-            s["sf"] += 1
-
-        # Runs allowed proxy (sum RBIs)
-        s["ra"] += (pa.rbis or 0)
-
-    result = []
-    for pid, s in agg.items():
-        ip = _outs_to_ip_str(s["outs"])
-        era = _era_approx(s["ra"], s["outs"])
-        result.append(
-            PitcherStats(
-                pitcher_id=pid, first_name=s["first"], last_name=s["last"],
-                bf=s["bf"], ab=s["ab"], h=s["h"], bb=s["bb"], hbp=s["hbp"], so=s["so"], hr=s["hr"], sf=s["sf"],
-                outs=s["outs"], ip=ip, ra=s["ra"], era=era
-            )
-        )
+def _pitching_line(pitcher: Player, c: Counters, league: LeagueConstants | None = None) -> PitcherStats:
+    return PitcherStats(
+        pitcher_id=pitcher.id, first_name=pitcher.first_name, last_name=pitcher.last_name,
+        **_pitching_values(c, league),
+    )
+
+def compute_game_pitching(db: Session, game_id: int) -> GamePitching:
+    # Game-scoped only, like box scores: no FIP
+    _, pitching_counters = load_game_counters(db, game_id)
+    pitchers = _players_by_id(db, pitching_counters)
+    result = [_pitching_line(pitchers[pid], c) for pid, c in pitching_counters.items() if pid in pitchers]
     return GamePitching(game_id=game_id, pitching=result)
 
 def compute_season_pitching(db: Session, season_id: int) -> list[PitcherStats]:
-    rows = (
-        db.query(PlateAppearance, Player)
-          .join(Player, Player.id == PlateAppearance.pitcher_id)
-          .join(Game, Game.id == PlateAppearance.game_id)
-          .filter(Game.season_id == season_id, PlateAppearance.pitcher_id.isnot(None))
-          .all()
-    )
-
-    agg = {}
-    for pa, pitcher in rows:
-        pid = pitcher.id
-        s = agg.setdefault(pid, {
-            "first": pitcher.first_name, "last": pitcher.last_name,
-            "bf": 0, "ab": 0, "h": 0, "bb": 0, "hbp": 0, "so": 0, "hr": 0, "sf": 0, "outs": 0, "ra": 0
-        })
-        s["bf"] += 1
-        r = pa.result
-        if r in (PAResult.SINGLE, PAResult.DOUBLE, PAResult.TRIPLE, PAResult.HOMERUN, PAResult.OUT, PAResult.STRIKEOUT):
-            s["ab"] += 1
-        if r in (PAResult.SINGLE, PAResult.DOUBLE, PAResult.TRIPLE, PAResult.HOMERUN):
-            s["h"] += 1
-        if r == PAResult.HOMERUN:
-            s["hr"] += 1
-        if r == PAResult.WALK:
-            s["bb"] += 1
-        if r == PAResult.HBP:
-            s["hbp"] += 1
-        if r in (PAResult.STRIKEOUT, PAResult.OUT, PAResult.SAC_FLY):
-            s["outs"] += 1
-        if r == PAResult.STRIKEOUT:
-            s["so"] += 1    
-        if r == PAResult.SAC_FLY:
-            s["sf"] += 1
-        s["ra"] += (pa.rbis or 0)
-
-    result = []
-    for pid, s in agg.items():
-        ip = _outs_to_ip_str(s["outs"])
-        era = _era_approx(s["ra"], s["outs"])
-        result.append(
-            PitcherStats(
-                pitcher_id=pid, first_name=s["first"], last_name=s["last"],
-                bf=s["bf"], ab=s["ab"], h=s["h"], bb=s["bb"], hbp=s["hbp"], so=s["so"], hr=s["hr"], sf=s["sf"],
-                outs=s["outs"], ip=ip, ra=s["ra"], era=era
-            )
-        )
-    return result
+    batting, pitching = _season_counters(db, season_id)
+    league = _league_constants(season_id, batting, pitching)
+    pitchers = _season_players(db, season_id, pitching)
+    return [_pitching_line(pitchers[pid], c, league) for pid, c in pitching.items() if pid in pitchers]
 
 def compute_season_pitching_leaderboard(
     db: Session,
     season_id: int,
     min_ip: float = 0.0,   # e.g., 10.0 means 10 innings minimum
     limit: int = 10,
+    metric: PitchingMetric = "era",
 ) -> List[PitcherStats]:
     # Reuse the season aggregation
     stats = compute_season_pitching(db, season_id)
@@ -266,8 +276,101 @@ def compute_season_pitching_leaderboard(
     qualified = [s for s in stats if s.outs >= max(1, min_outs)]
 
     # Sort by ERA ascending; tie-breakers: more outs (IP), fewer RA, more SO
-    qualified.sort(
-        key=lambda s: (s.era, -s.outs, s.ra, -s.so)
+    key_map = {
+        "era": lambda s: (s.era, -s.outs, s.ra, -s.so),
+        "fip": lambda s: (s.fip or 0.0, s.era, -s.outs),
+        "k_pct": lambda s: (-s.k_pct, s.bb_pct, -s.outs),
+        "bb_pct": lambda s: (s.bb_pct, -s.k_pct, -s.outs),
+    }
+    qualified.sort(key=key_map.get(metric, key_map["era"]))
+
+    return qualified[: max(0, limit)]
+
+def compute_team_stats(db: Session, team: Team) -> TeamStats:
+    """Team totals from the incrementally maintained team counters and record."""
+    sides = {
+        row.side: counters_from_row(row)
+        for row in db.query(TeamCounter).filter(TeamCounter.team_id == team.id).all()
+    }
+    record = db.get(TeamRecord, team.id)
+    return TeamStats(
+        team_id=team.id, season_id=team.season_id, name=team.name,
+        wins=record.wins if record else 0,
+        losses=record.losses if record else 0,
+        ties=record.ties if record else 0,
+        runs_for=record.runs_for if record else 0,
+        runs_against=record.runs_against if record else 0,
+        batting=BattingLine(**_batting_values(sides.get("batting") or new_counters())),
+        pitching=PitchingLine(**_pitching_values(sides.get("pitching") or new_counters())),
     )
 
-    return qualified[: max(0, limit)]
\ No newline at end of file
+def compute_standings(db: Session, season_id: int) -> list[StandingsRow]:
+    rows = (
+        db.query(Team, TeamRecord)
+          .outerjoin(TeamRecord, TeamRecord.team_id == Team.id)
+          .filter(Team.season_id == season_id)
+          .all()
+    )
+    standings = []
+    for team, rec in rows:
+        w, l, t = (rec.wins, rec.losses, rec.ties) if rec else (0, 0, 0)
+        rf, ra = (rec.runs_for, rec.runs_against) if rec else (0, 0)
+        standings.append(StandingsRow(
+            team_id=team.id, name=team.name, wins=w, losses=l, ties=t,
+            # ties count as half a win
+            pct=_safe_div(w + 0.5 * t, w + l + t),
+            runs_for=rf, runs_against=ra, run_diff=rf - ra, games_back=0.0,
+        ))
+    if not standings:
+        return standings
+
+    leader = max(standings, key=lambda s: s.wins - s.losses)
+    for s in standings:
+        s.games_back = ((leader.wins - s.wins) + (s.losses - leader.losses)) / 2
+    standings.sort(key=lambda s: (-s.pct, s.games_back, -s.run_diff, s.name))
+    return standings
+
+def compute_career(db: Session, person: Person) -> Career:
+    """Career lines summed from per-season rollups: one row per season played per side."""
+    rows = (
+        db.query(PlayerSeasonRollup, Player.team_id)
+          .join(Player, Player.id == PlayerSeasonRollup.player_id)
+          .filter(Player.person_id == person.id)
+          .order_by(PlayerSeasonRollup.season_id, PlayerSeasonRollup.player_id)
+          .all()
+    )
+    seasons: dict[int, CareerSeason] = {}
+    totals = {"batting": [], "pitching": []}
+    for rollup, team_id in rows:
+        c = counters_from_row(rollup)
+        totals[rollup.side].append(c)
+        season = seasons.get(rollup.player_id)
+        if season is None:
+            season = seasons[rollup.player_id] = CareerSeason(
+                season_id=rollup.season_id, player_id=rollup.player_id, team_id=team_id,
+            )
+        if rollup.side == "batting":
+            season.batting = BattingLine(**_batting_values(c))
+        else:
+            season.pitching = PitchingLine(**_pitching_values(c))
+    return Career(
+        person_id=person.id, first_name=person.first_name, last_name=person.last_name,
+        batting=BattingLine(**_batting_values(_sum_counters(totals["batting"]))),
+        pitching=PitchingLine(**_pitching_values(_sum_counters(totals["pitching"]))),
+        seasons=list(seasons.values()),
+    )
+
+def compute_career_matchup(db: Session, batter: Person, pitcher: Person) -> CareerMatchup:
+    """A person's batting line against another, summed over every pair of their season players."""
+    batter_player, pitcher_player = aliased(Player), aliased(Player)
+    rows = (
+        db.query(MatchupCounter)
+          .join(batter_player, batter_player.id == MatchupCounter.batter_id)
+          .join(pitcher_player, pitcher_player.id == MatchupCounter.pitcher_id)
+          .filter(batter_player.person_id == batter.id, pitcher_player.person_id == pitcher.id)
+          .all()
+    )
+    return CareerMatchup(
+        batter_person_id=batter.id, pitcher_person_id=pitcher.id,
+        batting=BattingLine(**_batting_values(_sum_counters(counters_from_row(r) for r in rows))),
+    )
@@ -0,0 +1,234 @@
+"""Concurrent live-game load generator.
+
+Simulates N live games: one scorer per game posts a realistic PA stream to /pa
+(re-sending some events with the same client_event_id, as a flaky client would),
+M viewers per game poll the boxscore and pitching lines, and a few season viewers
+hit the leaderboards. Reports throughput, latency percentiles and error rates per
+endpoint.
+
+    python -m loadtest.harness loadtest/scenarios/smoke.json --in-process --create-schema
+    python -m loadtest.harness loadtest/scenarios/release.json --base-url http://127.0.0.1:8000
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+import httpx
+
+# Rough league-wide PA outcome mix
+OUTCOME_WEIGHTS = {
+    "OUT": 0.44, "K": 0.22, "1B": 0.15, "2B": 0.045, "3B": 0.005,
+    "HR": 0.03, "BB": 0.08, "HBP": 0.01, "SF": 0.02,
+}
+OUTS = {"OUT": 1, "K": 1, "SF": 1}
+
+@dataclass
+class Scenario:
+    name: str
+    games: int = 4
+    duration_s: float = 30.0
+    seed: int = 0
+    innings: int = 9
+    pa_interval_s: float = 0.5
+    retry_rate: float = 0.05
+    viewers_per_game: int = 5
+    viewer_poll_s: float = 1.0
+    leaderboard_viewers: int = 2
+    leaderboard_poll_s: float = 2.0
+    timeout_s: float = 10.0
+
+def load_scenario(path: str | Path) -> Scenario:
+    data = json.loads(Path(path).read_text())
+    data.setdefault("name", Path(path).stem)
+    return Scenario(**data)
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+@dataclass
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kw) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            resp = await client.request(method, url, **kw)
+        except httpx.HTTPError:
+            resp = None
+        self.latencies[label].append(time.perf_counter() - start)
+        if resp is None or resp.status_code >= 400:
+            self.errors[label] += 1
+        return resp
+
+    def summarize(self, elapsed_s: float) -> dict:
+        endpoints = {}
+        for label in sorted(self.latencies):
+            lat = sorted(self.latencies[label])
+            n = len(lat)
+            endpoints[label] = {
+                "requests": n,
+                "errors": self.errors[label],
+                "error_rate": round(self.errors[label] / n, 4) if n else 0.0,
+                "rps": round(n / elapsed_s, 2) if elapsed_s else 0.0,
+                "p50_ms": round(percentile(lat, 50) * 1000, 2),
+                "p95_ms": round(percentile(lat, 95) * 1000, 2),
+                "p99_ms": round(percentile(lat, 99) * 1000, 2),
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        errors = sum(e["errors"] for e in endpoints.values())
+        return {
+            "elapsed_s": round(elapsed_s, 2),
+            "requests": total,
+            "rps": round(total / elapsed_s, 2) if elapsed_s else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "endpoints": endpoints,
+        }
+
+async def _setup(client: httpx.AsyncClient, sc: Scenario) -> tuple[int, list[dict]]:
+    async def post(url, body):
+        resp = await client.post(url, json=body)
+        resp.raise_for_status()
+        return resp.json()
+
+    season = await post("/seasons", {"name": f"loadtest {sc.name}", "year": 2025})
+    games = []
+    for g in range(sc.games):
+        teams = []
+        for side in ("home", "away"):
+            team = await post("/teams", {"season_id": season["id"], "name": f"{side}-{g}"})
+            players = [
+                await post("/players", {"team_id": team["id"], "first_name": f"P{i}", "last_name": f"{side}{g}"})
+                for i in range(10)
+            ]
+            teams.append((team, players))
+        (home, home_players), (away, away_players) = teams
+        game = await post("/games", {"season_id": season["id"], "home_team_id": home["id"], "away_team_id": away["id"]})
+        entries = [
+            {"team_id": team["id"], "batting_order": i + 1, "player_id": p["id"]}
+            for team, players in teams for i, p in enumerate(players[:9])
+        ]
+        await post(f"/games/{game['id']}/lineup", {"entries": entries})
+        games.append({
+            "id": game["id"],
+            # (batters, pitcher) for top / bottom halves
+            "top": ([p["id"] for p in away_players[:9]], home_players[9]["id"]),
+            "bottom": ([p["id"] for p in home_players[:9]], away_players[9]["id"]),
+        })
+    return season["id"], games
+
+async def _scorer(client, rec: Recorder, sc: Scenario, game: dict, rng: random.Random, stop: asyncio.Event):
+    results, weights = zip(*OUTCOME_WEIGHTS.items())
+    order = {"top": 0, "bottom": 0}
+    for inning in range(1, sc.innings + 1):
+        for half in ("top", "bottom"):
+            batters, pitcher = game[half]
+            outs = 0
+            while outs < 3:
+                if stop.is_set():
+                    return
+                result = rng.choices(results, weights)[0]
+                outs += OUTS.get(result, 0)
+                body = {
+                    "game_id": game["id"], "inning": inning, "half": half,
+                    "batter_id": batters[order[half] % 9], "pitcher_id": pitcher,
+                    "result": result, "rbis": 1 if result in ("HR", "SF") else 0,
+                    "client_event_id": uuid.uuid4().hex,
+                }
+                order[half] += 1
+                await rec.call(client, "POST /pa", "POST", "/pa", json=body)
+                if rng.random() < sc.retry_rate:
+                    await rec.call(client, "POST /pa (retry)", "POST", "/pa", json=body)
+                await asyncio.sleep(sc.pa_interval_s)
+    await rec.call(client, "PATCH /games/{id}/status", "PATCH", f"/games/{game['id']}/status", json={"status": "final"})
+
+async def _viewer(client, rec: Recorder, sc: Scenario, game_id: int, rng: random.Random, stop: asyncio.Event):
+    await asyncio.sleep(rng.random() * sc.viewer_poll_s)
+    while not stop.is_set():
+        await rec.call(client, "GET /pa/boxscore/{id}", "GET", f"/pa/boxscore/{game_id}")
+        await rec.call(client, "GET /games/{id}/pitching", "GET", f"/games/{game_id}/pitching")
+        await asyncio.sleep(sc.viewer_poll_s)
+
+async def _season_viewer(client, rec: Recorder, sc: Scenario, season_id: int, rng: random.Random, stop: asyncio.Event):
+    await asyncio.sleep(rng.random() * sc.leaderboard_poll_s)
+    while not stop.is_set():
+        await rec.call(client, "GET /seasons/{id}/leaderboard", "GET", f"/seasons/{season_id}/leaderboard")
+        await rec.call(client, "GET /seasons/{id}/pitching/leaderboard", "GET", f"/seasons/{season_id}/pitching/leaderboard")
+        await asyncio.sleep(sc.leaderboard_poll_s)
+
+async def run(sc: Scenario, client: httpx.AsyncClient) -> dict:
+    rng = random.Random(sc.seed)
+    season_id, games = await _setup(client, sc)
+    rec = Recorder()
+    stop = asyncio.Event()
+
+    tasks = []
+    for game in games:
+        tasks.append(_scorer(client, rec, sc, game, random.Random(rng.random()), stop))
+        tasks += [_viewer(client, rec, sc, game["id"], random.Random(rng.random()), stop) for _ in range(sc.viewers_per_game)]
+    tasks += [_season_viewer(client, rec, sc, season_id, random.Random(rng.random()), stop) for _ in range(sc.leaderboard_viewers)]
+
+    async def _timer():
+        await asyncio.sleep(sc.duration_s)
+        stop.set()
+
+    start = time.perf_counter()
+    await asyncio.gather(_timer(), *tasks)
+    report = rec.summarize(time.perf_counter() - start)
+    report["scenario"] = sc.name
+    return report
+
+def _client(args, sc: Scenario) -> httpx.AsyncClient:
+    if args.in_process:
+        from app.main import app
+        if args.create_schema:
+            from app.db import Base, engine
+            Base.metadata.create_all(engine)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        return httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=sc.timeout_s)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    return httpx.AsyncClient(base_url=args.base_url, timeout=sc.timeout_s, limits=limits)
+
+def _print_report(report: dict) -> None:
+    print(f"scenario {report['scenario']}: {report['requests']} requests in {report['elapsed_s']}s "
+          f"({report['rps']} req/s, error rate {report['error_rate']:.2%})")
+    print(f"{'endpoint':42} {'reqs':>7} {'err%':>7} {'rps':>8} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8}")
+    for label, e in report["endpoints"].items():
+        print(f"{label:42} {e['requests']:>7} {e['error_rate']:>7.2%} {e['rps']:>8} "
+              f"{e['p50_ms']:>8} {e['p95_ms']:>8} {e['p99_ms']:>8}")
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenario", help="Path to a scenario JSON file")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server to load (default: %(default)s)")
+    target.add_argument("--in-process", action="store_true", help="Drive app.main:app through ASGI, no server")
+    parser.add_argument("--create-schema", action="store_true", help="Create tables first (in-process only)")
+    parser.add_argument("--json", dest="json_out", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    sc = load_scenario(args.scenario)
+
+    async def _main():
+        async with _client(args, sc) as client:
+            return await run(sc, client)
+
+    report = asyncio.run(_main())
+    _print_report(report)
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2))
+    return 1 if report["error_rate"] > 0 else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
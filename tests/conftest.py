@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db import Base
+from app import models
+
+@pytest.fixture
+def engine():
+    # One shared connection, so sessions opened by the code under test see the test's data
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True,
+                           connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False, autocommit=False)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def scaffold(db):
+    """Build a season with teams, players and one game between the first two teams.
+
+    Rosters are keyword arguments in team order: a list of "First Last" names, or a count
+    of players named after the team. A single team plays itself.
+
+        s = scaffold(A=["Ada Lovelace", "Grace Hopper"])
+        ada, grace = s.players["A"]; s.game; s.season
+    """
+    def build(year: int = 2025, status: models.GameStatus = models.GameStatus.live, **rosters) -> SimpleNamespace:
+        season = models.Season(name=str(year), year=year)
+        db.add(season); db.flush()
+        teams = {name: models.Team(season_id=season.id, name=name) for name in rosters}
+        db.add_all(teams.values()); db.flush()
+        players = {}
+        for name, roster in rosters.items():
+            names = [(name, str(i)) for i in range(roster)] if isinstance(roster, int) else [n.split(" ", 1) for n in roster]
+            players[name] = [models.Player(team_id=teams[name].id, first_name=f, last_name=l) for f, l in names]
+            db.add_all(players[name])
+        home, away = (list(teams.values()) * 2)[:2]
+        game = models.Game(season_id=season.id, home_team_id=home.id, away_team_id=away.id, status=status)
+        db.add(game)
+        db.commit()
+        return SimpleNamespace(season=season, teams=teams, players=players, game=game)
+    return build
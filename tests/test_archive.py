@@ -0,0 +1,75 @@
+import json
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from app import models, schemas
+from app.routers.games import set_status
+from app.routers.plate_appearances import add_pa, remove_pa, update_pa
+from app.services import archive
+from app.services.stats import compute_season_stats, compute_season_pitching
+from app.models import PAResult, HalfInning, GameStatus
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path))
+
+def test_archived_season_matches_database(db, scaffold):
+    sc = scaffold(2019, A=["Ada Lovelace", "Alan Turing"])
+    s, g = sc.season, sc.game
+    b, p = sc.players["A"]
+    for r in (PAResult.SINGLE, PAResult.HOMERUN, PAResult.STRIKEOUT, PAResult.WALK, PAResult.SAC_FLY):
+        db.add(models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top, batter_id=b.id,
+                                      pitcher_id=p.id, result=r, rbis=1 if r == PAResult.HOMERUN else 0))
+    db.add(models.PlateAppearance(game_id=g.id, inning=2, half=HalfInning.top, batter_id=b.id, result=PAResult.OUT))
+    db.commit()
+
+    with pytest.raises(ValueError):
+        archive.export_season(db, s.id)
+    g.status = GameStatus.final
+    db.commit()
+
+    db.add(models.PACorrection(pa_id=1, game_id=g.id, action="update", before={"result": "OUT"},
+                               after={"result": "1B"}, game_version=1))
+    db.commit()
+
+    batting_before = compute_season_stats(db, s.id)
+    pitching_before = compute_season_pitching(db, s.id)
+    archive.export_season(db, s.id, delete=True)
+    db.commit()
+    assert db.query(models.PlateAppearance).count() == 0
+    assert db.query(models.Game).count() == 0
+    assert db.query(models.PACorrection).count() == 0
+    corrections = json.loads((archive.season_dir(s.id) / "corrections.json").read_text())
+    assert [(c["pa_id"], c["after"]) for c in corrections] == [(1, {"result": "1B"})]
+
+    # The archive is now the only copy: exporting again must not replace it
+    for force in (False, True):
+        with pytest.raises(ValueError):
+            archive.export_season(db, s.id, force=force)
+
+    archived = archive.open_season(s.id)
+    assert isinstance(archived.pa, np.memmap) and len(archived.pa) == 6
+    assert compute_season_stats(db, s.id) == batting_before
+    assert compute_season_pitching(db, s.id) == pitching_before
+
+def test_archived_season_is_read_only(db, scaffold):
+    sc = scaffold(2019, GameStatus.final, A=["Ada Lovelace"])
+    s, g = sc.season, sc.game
+    (b,) = sc.players["A"]
+    pa = models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top, batter_id=b.id, result=PAResult.SINGLE)
+    db.add(pa)
+    db.commit()
+    archive.export_season(db, s.id)  # rows stay in the database
+    db.commit()
+
+    payload = schemas.PACreate(game_id=g.id, inning=2, half=HalfInning.top, batter_id=b.id, result=PAResult.HOMERUN)
+    for write in (
+        lambda: add_pa(payload, db),
+        lambda: update_pa(pa.id, schemas.PAUpdate(result=PAResult.DOUBLE), db),
+        lambda: remove_pa(pa.id, None, db),
+        lambda: set_status(g.id, schemas.GameStatusUpdate(status=GameStatus.live), db),
+    ):
+        with pytest.raises(HTTPException) as err:
+            write()
+        assert err.value.status_code == 409
+    assert [line.h for line in compute_season_stats(db, s.id)] == [1]
@@ -0,0 +1,101 @@
+import os
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.services.cache import StatsCache, stats_cache
+from app.services.notify import CacheListener, publish_invalidation
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+def test_invalidate_drops_scope_and_skips_stale_store():
+    cache = StatsCache()
+    assert cache.get_or_compute("game", 1, "box", lambda: "v1") == "v1"
+    assert cache.get_or_compute("game", 1, "box", lambda: "v2") == "v1"
+
+    cache.invalidate(game_ids=[1])
+    assert cache.get_or_compute("game", 1, "box", lambda: "v2") == "v2"
+
+    def racing_compute():
+        # A write lands while this value is being computed
+        cache.invalidate(season_ids=[7])
+        return "stale"
+    assert cache.get_or_compute("season", 7, "stats", racing_compute) == "stale"
+    assert cache.get_or_compute("season", 7, "stats", lambda: "fresh") == "fresh"
+
+def test_entries_per_scope_are_bounded():
+    cache = StatsCache(max_entries_per_scope=2)
+    for limit in (10, 20):
+        cache.get_or_compute("season", 1, ("leaderboard", limit), lambda: limit)
+    cache.get_or_compute("season", 1, ("leaderboard", 10), lambda: "recomputed")  # refreshes 10
+    cache.get_or_compute("season", 1, ("leaderboard", 30), lambda: 30)            # evicts 20
+    assert cache.get_or_compute("season", 1, ("leaderboard", 10), lambda: "recomputed") == 10
+    assert cache.get_or_compute("season", 1, ("leaderboard", 20), lambda: "recomputed") == "recomputed"
+
+def test_listener_handles_payloads():
+    cache = StatsCache()
+    listener = CacheListener("postgresql://unused", cache=cache)
+    cache.get_or_compute("game", 1, "box", lambda: 1)
+    cache.get_or_compute("season", 2, "stats", lambda: 2)
+
+    listener.handle('{"games": [1], "seasons": []}')
+    assert cache.get_or_compute("game", 1, "box", lambda: 10) == 10
+    assert cache.get_or_compute("season", 2, "stats", lambda: 20) == 2
+
+    listener.handle('{"flush": true}')
+    assert cache.get_or_compute("season", 2, "stats", lambda: 20) == 20
+
+def test_local_invalidation_waits_for_commit():
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    db = sessionmaker(bind=engine)()
+    stats_cache.flush()
+    stats_cache.get_or_compute("game", 5, "box", lambda: "old")
+
+    publish_invalidation(db, game_ids=[5])
+    db.rollback()
+    assert stats_cache.get_or_compute("game", 5, "box", lambda: "new") == "old"
+
+    publish_invalidation(db, game_ids=[5])
+    db.commit()
+    assert stats_cache.get_or_compute("game", 5, "box", lambda: "new") == "new"
+    db.close()
+
+@pytest.mark.skipif(not TEST_DATABASE_URL.startswith("postgresql"), reason="needs TEST_DATABASE_URL pointing at PostgreSQL")
+def test_notify_reaches_other_worker():
+    engine = create_engine(TEST_DATABASE_URL, future=True)
+    worker_cache = StatsCache()
+    listener = CacheListener(engine.url, cache=worker_cache, poll_timeout=0.2)
+    listener.start()
+    try:
+        assert listener.connected.wait(5)
+        worker_cache.get_or_compute("season", 3, "stats", lambda: "old")
+
+        db = sessionmaker(bind=engine)()
+        publish_invalidation(db, season_ids=[3])
+        db.commit()
+        db.close()
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if worker_cache.get_or_compute("season", 3, "stats", lambda: "new") == "new":
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("invalidation was not delivered")
+
+        # Kill the listener's backend; it must reconnect and flush
+        worker_cache.get_or_compute("game", 9, "box", lambda: "old")
+        with engine.connect() as conn:
+            conn.execute(text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE query LIKE 'LISTEN%' OR query = 'SELECT 1'"
+            ))
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if worker_cache.get_or_compute("game", 9, "box", lambda: "new") == "new":
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("listener did not reconnect and flush")
+    finally:
+        listener.stop()
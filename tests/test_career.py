@@ -0,0 +1,44 @@
+from app import models
+from app.services.aggregates import apply_pa
+from app.services.corrections import delete_pa
+from app.services.stats import compute_career, compute_career_matchup
+from app.models import PAResult, HalfInning
+
+def test_career_sums_season_rollups(db, scaffold):
+    person = models.Person(first_name="Ada", last_name="Lovelace")
+    grace = models.Person(first_name="Grace", last_name="Hopper")
+    db.add_all([person, grace]); db.flush()
+
+    def season(year, results, pitches=False):
+        sc = scaffold(year, A=["Ada Lovelace", "Grace Hopper"])
+        ada, other = sc.players["A"]
+        ada.person_id, other.person_id = person.id, grace.id
+        g = sc.game
+        pas = []
+        for r in results:
+            batter, pitcher = (other, ada) if pitches else (ada, other)
+            pa = models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top, batter_id=batter.id,
+                                        pitcher_id=pitcher.id, result=r, rbis=1 if r == PAResult.HOMERUN else 0)
+            db.add(pa); db.flush()
+            apply_pa(db, pa, g)
+            pas.append(pa)
+        db.commit()
+        return g, pas
+
+    season(2023, [PAResult.HOMERUN, PAResult.OUT])
+    g, pas = season(2024, [PAResult.SINGLE, PAResult.STRIKEOUT, PAResult.WALK])
+    season(2025, [PAResult.STRIKEOUT, PAResult.STRIKEOUT, PAResult.OUT], pitches=True)
+
+    career = compute_career(db, person)
+    assert [s.season_id for s in career.seasons] == [1, 2, 3]
+    assert (career.batting.ab, career.batting.h, career.batting.hr, career.batting.bb) == (4, 2, 1, 1)
+    assert career.pitching.so == 2 and career.pitching.ip == "1.0"
+    assert career.seasons[2].batting is None and career.seasons[0].pitching is None
+    # Matchup counters are per season player; the career line spans 2023 and 2024
+    matchup = compute_career_matchup(db, person, grace).batting
+    assert (matchup.ab, matchup.h, matchup.hr, matchup.bb) == (4, 2, 1, 1)
+
+    # Corrections flow through to the rollups
+    delete_pa(db, pas[0], g)
+    db.commit()
+    assert compute_career(db, person).batting.h == 1
@@ -0,0 +1,63 @@
+from app import models
+from app.services.aggregates import apply_pa, apply_game_result
+from app.services.corrections import correct_pa, delete_pa
+from app.services.snapshots import maybe_snapshot, verify_snapshot, latest_snapshot
+from app.services.stats import compute_standings, compute_team_stats, compute_matchup
+from app.models import PAResult, HalfInning
+
+def test_correct_and_delete_move_every_derived_stat(db, scaffold):
+    sc = scaffold(H=["Grace Hopper"], A=["Ada Lovelace"])
+    s, g, away = sc.season, sc.game, sc.teams["A"]
+    (pitcher,), (batter,) = sc.players.values()
+
+    pas = []
+    for r in (PAResult.HOMERUN, PAResult.SINGLE, PAResult.STRIKEOUT):
+        pa = models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top, batter_id=batter.id,
+                                    pitcher_id=pitcher.id, result=r, rbis=1 if r == PAResult.HOMERUN else 0)
+        db.add(pa); db.flush()
+        apply_pa(db, pa, g)
+        pas.append(pa)
+    assert maybe_snapshot(db, g.id, interval=3) is not None
+    apply_game_result(db, g)
+    g.status = models.GameStatus.final
+    db.commit()
+    assert compute_standings(db, s.id)[0].name == "A"
+
+    # The home run was really a fly out: the visitors no longer win
+    correction = correct_pa(db, pas[0], g, {"result": PAResult.OUT, "rbis": 0}, reason="scorer error")
+    db.commit()
+    assert correction.before["result"] == "HR" and correction.after["result"] == "OUT"
+    assert correction.game_version == 1
+    assert (g.home_score, g.away_score) == (0, 0)
+    rows = {r.name: r for r in compute_standings(db, s.id)}
+    assert (rows["A"].wins, rows["A"].ties, rows["H"].ties) == (0, 1, 1)
+    assert compute_matchup(db, batter.id, pitcher.id).batting.hr == 0
+    assert verify_snapshot(db, g.id)["ok"]
+
+    delete_pa(db, pas[1], g, reason="duplicate")
+    db.commit()
+    assert g.version == 2
+    assert compute_team_stats(db, away).batting.ab == 2
+    assert latest_snapshot(db, g.id).event_count == 2
+    assert verify_snapshot(db, g.id)["ok"]
+    assert db.query(models.PACorrection).count() == 2
+
+def test_pa_retry_racing_the_original_returns_it(db, scaffold, monkeypatch):
+    from sqlalchemy.orm import Query
+    from app import schemas
+    from app.routers.plate_appearances import add_pa
+
+    sc = scaffold(A=["Ada Lovelace"])
+    (ada,), g = sc.players["A"], sc.game
+    payload = schemas.PACreate(game_id=g.id, inning=1, half=HalfInning.top, batter_id=ada.id,
+                               result=PAResult.HOMERUN, rbis=1, client_event_id="evt-1")
+    first = add_pa(payload, db)
+
+    # The retry's existence check runs before the original commits, so it misses
+    real = Query.one_or_none
+    misses = iter([True])
+    monkeypatch.setattr(Query, "one_or_none", lambda q: None if next(misses, False) else real(q))
+    assert add_pa(payload, db).id == first.id
+    db.refresh(g)
+    assert (g.version, g.away_score) == (1, 1)
+    assert compute_team_stats(db, sc.teams["A"]).batting.hr == 1
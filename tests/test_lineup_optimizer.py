@@ -0,0 +1,28 @@
+import numpy as np
+from app import models
+from app.services import lineup_optimizer as lo
+from app.services.simulation import DEFAULT_RATES, OUTCOMES
+from app.models import PAResult, HalfInning
+
+def test_expected_runs_orders_and_symmetry(db, scaffold):
+    sc = scaffold(A=9)
+    s, g, players = sc.season, sc.game, sc.players["A"]
+    # Two identical sluggers and seven identical weak hitters
+    for i, p in enumerate(players):
+        for r in [PAResult.HOMERUN] * 20 + [PAResult.WALK] * 20 if i < 2 else [PAResult.OUT] * 30 + [PAResult.SINGLE] * 10:
+            db.add(models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top, batter_id=p.id, result=r, rbis=0))
+    db.commit()
+
+    ids = [p.id for p in players]
+    chains = lo.player_transitions(db, s.id, list(reversed(ids)))
+    result = lo.optimize(chains, list(reversed(ids)))
+    # 9! orders collapse to 9! / (2! 7!) = 36 class sequences, all scored
+    assert result.exhaustive and result.evaluated == 36
+    best_order, best_runs = result.best[0]
+    assert set(best_order[:2]) == {players[0].id, players[1].id}
+    assert best_runs > result.current[1]
+
+    league = np.array([DEFAULT_RATES[f] for f in OUTCOMES])
+    avg = lo.transitions(league / league.sum())
+    runs = lo.expected_runs(np.zeros((1, 9), np.intp), avg.moves[None], avg.runs[None], avg.ends[None])[0]
+    assert 3.5 < runs < 5.5
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import HTTPException
+from app import models, schemas
+from app.routers.games import get_lineup, set_lineup
+from app.services.lineups import current_orders, read_lineup
+
+def test_lineup_versions_and_validation(db, scaffold):
+    sc = scaffold(H=10, A=0, X=1)
+    home, other, g = sc.teams["H"], sc.teams["X"], sc.game
+    hp, (xp,) = sc.players["H"], sc.players["X"]
+
+    entry = lambda order, p: schemas.LineupEntry(team_id=home.id, batting_order=order, player_id=p.id)
+    assert set_lineup(g.id, schemas.LineupSet(entries=[entry(i + 1, p) for i, p in enumerate(hp[:9])]), db)["versions"] == {home.id: 1}
+    # Substitute in slot 9: a new version, the original stays readable
+    sub = [entry(i + 1, p) for i, p in enumerate(hp[:8])] + [entry(9, hp[9])]
+    assert set_lineup(g.id, schemas.LineupSet(entries=sub), db)["versions"] == {home.id: 2}
+
+    current = read_lineup(db, g.id)
+    assert [(t.team_id, t.version) for t in current.teams] == [(home.id, 2)]
+    assert current.teams[0].slots[8].player_id == hp[9].id and current.teams[0].slots[8].last_name == "9"
+    assert read_lineup(db, g.id, version=1, team_id=home.id).teams[0].slots[8].player_id == hp[8].id
+    assert current_orders(db, [g.id])[(g.id, home.id)][-1] == hp[9].id
+
+    with pytest.raises(HTTPException) as err:
+        set_lineup(g.id, schemas.LineupSet(entries=[entry(1, xp)]), db)
+    assert err.value.status_code == 400
+    with pytest.raises(HTTPException) as err:
+        set_lineup(g.id, schemas.LineupSet(entries=[schemas.LineupEntry(team_id=other.id, batting_order=1, player_id=xp.id)]), db)
+    assert err.value.status_code == 400
+    assert db.query(models.Lineup).count() == 18
+
+def test_lineup_versions_are_per_team(db, scaffold):
+    sc = scaffold(H=1, A=1)
+    home, away, g = sc.teams["H"], sc.teams["A"], sc.game
+    (hp,), (ap,) = sc.players["H"], sc.players["A"]
+    lineup = lambda *entries: schemas.LineupSet(entries=[
+        schemas.LineupEntry(team_id=team.id, batting_order=1, player_id=p.id) for team, p in entries
+    ])
+    set_lineup(g.id, lineup((home, hp), (away, ap)), db)
+    set_lineup(g.id, lineup((home, hp)), db)
+    set_lineup(g.id, lineup((home, hp)), db)
+
+    # Home is on version 3 and away on version 1; version=1 must not mix the two teams
+    assert [(t.team_id, t.version) for t in get_lineup(g.id, version=1, team_id=home.id, db=db).teams] == [(home.id, 1)]
+    assert [(t.team_id, t.version) for t in get_lineup(g.id, version=None, team_id=away.id, db=db).teams] == [(away.id, 1)]
+    with pytest.raises(HTTPException) as err:
+        get_lineup(g.id, version=1, team_id=None, db=db)
+    assert err.value.status_code == 400
@@ -0,0 +1,17 @@
+from loadtest.harness import Recorder, percentile
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+def test_summary_reports_error_rate():
+    rec = Recorder()
+    rec.latencies["GET /x"] += [0.01, 0.02, 0.03, 0.04]
+    rec.errors["GET /x"] += 1
+    report = rec.summarize(elapsed_s=2.0)
+    x = report["endpoints"]["GET /x"]
+    assert x["requests"] == 4 and x["error_rate"] == 0.25 and x["rps"] == 2.0
+    assert x["p50_ms"] == 20.0 and x["p99_ms"] == 40.0
@@ -0,0 +1,36 @@
+from app import models
+from app.services.aggregates import apply_pa
+from app.services.stats import compute_matchup, compute_pitcher_matchups
+from app.models import PAResult, HalfInning
+
+def test_matchup_counters_follow_pa_writes(db, scaffold):
+    sc = scaffold(A=["Sam Smith", "Pat Lee", "Jo Jones"])
+    smith, lee, jones = sc.players["A"]
+    g = sc.game
+
+    def record(batter, result, rbis=0):
+        pa = models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top,
+                                    batter_id=batter.id, pitcher_id=jones.id, result=result, rbis=rbis)
+        db.add(pa)
+        apply_pa(db, pa, g)
+        db.commit()
+        return pa
+
+    record(smith, PAResult.HOMERUN, 2)
+    record(smith, PAResult.STRIKEOUT)
+    oops = record(smith, PAResult.SINGLE)
+    record(lee, PAResult.WALK)
+
+    line = compute_matchup(db, smith.id, jones.id)
+    assert line.batting.ab == 3 and line.batting.h == 2 and line.batting.hr == 1
+
+    # Removing a PA subtracts its contribution
+    apply_pa(db, oops, g, sign=-1)
+    db.delete(oops)
+    db.commit()
+    line = compute_matchup(db, smith.id, jones.id).batting
+    assert line.ab == 2 and line.h == 1
+
+    top = compute_pitcher_matchups(db, jones.id, sort="pa")
+    assert [m.batter_id for m in top] == [smith.id, lee.id]
+    assert compute_matchup(db, lee.id, smith.id).batting.pa == 0
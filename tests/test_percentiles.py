@@ -0,0 +1,30 @@
+from app.schemas import PlayerStats
+from app.services.percentiles import build_index, percentile_rank, player_percentiles
+from app.services.stats import BATTING_METRICS
+
+def _line(pid, pa, obp, k_pct):
+    return PlayerStats(
+        player_id=pid, first_name="P", last_name=str(pid),
+        ab=pa, h=0, bb=0, hbp=0, sf=0, tb=0,
+        avg=0.0, obp=obp, slg=0.0, ops=obp, pa=pa, k_pct=k_pct,
+    )
+
+def test_percentile_rank_midrank():
+    values = [0.1, 0.2, 0.2, 0.3]
+    assert percentile_rank(values, 0.3) == 87.5
+    assert percentile_rank(values, 0.2) == 50.0
+    assert percentile_rank(values, 0.1, lower_is_better=True) == 87.5
+    assert percentile_rank([], 0.5) == 0.0
+
+def test_index_pools_only_qualified_hitters():
+    stats = [_line(1, 100, 0.400, 0.10), _line(2, 100, 0.300, 0.20), _line(3, 100, 0.350, 0.30), _line(4, 5, 0.900, 0.0)]
+    index = build_index(stats, min_pa=50)
+    assert index.qualified_count == 3
+    assert tuple(index.sorted_values) == BATTING_METRICS  # the leaderboard's metrics, no more, no fewer
+    assert index.sorted_values["obp"] == [0.3, 0.35, 0.4]
+
+    best = player_percentiles(index, 1)
+    assert round(best["obp"], 1) == 83.3 and round(best["k_pct"], 1) == 83.3
+    # Unqualified hitters are still placed against the qualified pool
+    assert player_percentiles(index, 4)["obp"] == 100.0
+    assert player_percentiles(index, 99) is None
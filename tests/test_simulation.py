@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app import models
+from app.services import simulation
+from app.services.jobs import LeaseKeeper, owner, run_job
+from app.models import PAResult, HalfInning
+
+@pytest.fixture(autouse=True)
+def inline_workers(monkeypatch):
+    monkeypatch.setattr(simulation, "SIM_WORKERS", 0)
+
+def _cum(**rates):
+    p = np.zeros(simulation.N_OUTCOMES)
+    for field, rate in rates.items():
+        p[simulation.OUTCOMES.index(field)] = rate
+    return np.tile(np.cumsum(p), (9, 1))
+
+def test_transitions():
+    o = simulation.OUTCOMES.index
+    assert simulation.RUNS[o("bb"), 7, 0] == 1 and simulation.NEXT_BASES[o("bb"), 7, 0] == 7
+    assert simulation.RUNS[o("sf"), 4, 1] == 1 and simulation.RUNS[o("sf"), 4, 2] == 0
+    assert simulation.NEXT_BASES[o("singles"), 1, 0] == 3
+
+def test_game_outcomes_and_reproducibility():
+    spec = simulation.GameSpec(game_id=1, home_team_id=1, away_team_id=2,
+                               home_cum=_cum(hr=0.5, so=0.5), away_cum=_cum(so=1))
+    home, away = simulation.simulate_game(spec, 200, np.random.default_rng(0))
+    assert (away == 0).all() and (home > 0).all()
+    again, _ = simulation.simulate_game(spec, 200, np.random.default_rng(0))
+    assert (home == again).all()
+
+    live = simulation.GameSpec(game_id=1, home_team_id=1, away_team_id=2, home_cum=_cum(so=1), away_cum=_cum(so=1),
+                               inning=9, half=1, outs=2, home_runs=2, away_runs=3)
+    home, away = simulation.simulate_game(live, 10, np.random.default_rng(0))
+    assert (home == 2).all() and (away == 3).all()
+
+def test_season_odds_from_job(db, engine, scaffold):
+    sc = scaffold(status=models.GameStatus.final, Strong=1, Weak=1)
+    s, g = sc.season, sc.game
+    strong, weak = sc.teams.values()
+    (slugger,), (hacker,) = sc.players.values()
+    for _ in range(200):
+        db.add(models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.bottom,
+                                      batter_id=slugger.id, result=PAResult.HOMERUN, rbis=1))
+        db.add(models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top,
+                                      batter_id=hacker.id, result=PAResult.STRIKEOUT))
+    for _ in range(3):
+        db.add(models.Game(season_id=s.id, home_team_id=weak.id, away_team_id=strong.id))
+    db.commit()
+
+    params = {"n_sims": 300, "seed": 7, "playoff_teams": 1}
+    jobs = [models.SimulationJob(kind="season", target_id=s.id, params=params) for _ in range(2)]
+    db.add_all(jobs); db.commit()
+    for job in jobs:
+        run_job(sessionmaker(bind=engine), job.id)
+        db.refresh(job)
+    assert jobs[0].status == "done", jobs[0].error
+    result = jobs[0].result
+    assert result == jobs[1].result  # same seed, same answer
+    assert result["games_simulated"] == 3
+    top = result["teams"][0]
+    assert top["name"] == "Strong" and top["playoff_odds"] > 0.9 and top["proj_wins"] > 2.5
+
+def test_only_jobs_with_expired_leases_fail(db, engine):
+    now = datetime.utcnow()
+    job = lambda status, owner, age: models.SimulationJob(
+        kind="season", target_id=1, params={}, status=status, owner=owner, heartbeat_at=now - timedelta(seconds=age))
+    jobs = [
+        job("running", "other-worker", 5),     # another live worker's job
+        job("running", "dead-worker", 600),    # lease lapsed
+        job("queued", owner(), 600),           # ours: renewed below
+        job("done", "dead-worker", 600),
+    ]
+    db.add_all(jobs)
+    db.commit()
+    LeaseKeeper(sessionmaker(bind=engine)).tick()
+    db.expire_all()
+    assert [j.status for j in jobs] == ["running", "failed", "queued", "done"]
+    assert jobs[1].error.startswith("Interrupted") and jobs[0].error is None
+
+    # A failed job is never claimed and run again
+    run_job(sessionmaker(bind=engine), jobs[1].id)
+    db.refresh(jobs[1])
+    assert jobs[1].status == "failed" and jobs[1].result is None
@@ -0,0 +1,55 @@
+import pytest
+from app import models
+from app.services.snapshots import (
+    load_game_counters, replay_game, maybe_snapshot, rebuild_snapshots, verify_snapshot, latest_snapshot,
+)
+from app.services.stats import compute_boxscore, compute_game_pitching
+from app.models import PAResult, HalfInning
+
+@pytest.fixture
+def game(scaffold):
+    sc = scaffold(A=["Ada Lovelace", "Grace Hopper"])
+    return (sc.game, *sc.players["A"])
+
+def _add(db, g, batter, pitcher, results):
+    for i, r in enumerate(results):
+        db.add(models.PlateAppearance(
+            game_id=g.id, inning=1 + i // 3, half=HalfInning.top,
+            batter_id=batter.id, pitcher_id=pitcher.id, result=r, rbis=1 if r == PAResult.HOMERUN else 0,
+        ))
+    db.commit()
+
+def test_snapshot_plus_tail_matches_replay(db, game):
+    g, batter, pitcher = game
+    _add(db, g, batter, pitcher, [PAResult.SINGLE, PAResult.STRIKEOUT, PAResult.HOMERUN, PAResult.WALK])
+    assert maybe_snapshot(db, g.id, interval=3) is not None
+    db.commit()
+    assert latest_snapshot(db, g.id).event_count == 4
+
+    _add(db, g, batter, pitcher, [PAResult.DOUBLE, PAResult.OUT])
+    assert maybe_snapshot(db, g.id, interval=3) is None
+    assert load_game_counters(db, g.id) == replay_game(db, g.id)
+
+    ada = compute_boxscore(db, g.id).batting[0]
+    assert ada.ab == 5 and ada.h == 3 and ada.bb == 1 and ada.tb == 7
+    grace = compute_game_pitching(db, g.id).pitching[0]
+    assert grace.bf == 6 and grace.so == 1 and grace.hr == 1 and grace.outs == 2 and grace.ra == 1
+
+def test_rebuild_after_correction(db, game):
+    g, batter, pitcher = game
+    _add(db, g, batter, pitcher, [PAResult.SINGLE] * 6)
+    rebuild_snapshots(db, g.id, from_seq=0, interval=2)
+    db.commit()
+    assert verify_snapshot(db, g.id)["ok"]
+
+    # Correct an early event behind the snapshots' back
+    first = db.query(models.PlateAppearance).order_by(models.PlateAppearance.id).first()
+    first.result = PAResult.STRIKEOUT
+    db.commit()
+    report = verify_snapshot(db, g.id)
+    assert not report["ok"] and report["batting_mismatches"] == [batter.id]
+
+    assert rebuild_snapshots(db, g.id, from_seq=first.id, interval=2) == 3
+    db.commit()
+    assert verify_snapshot(db, g.id)["ok"]
+    assert compute_boxscore(db, g.id).batting[0].h == 5
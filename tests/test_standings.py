@@ -0,0 +1,69 @@
+from app import models
+from app.services.aggregates import apply_pa, apply_game_result
+from app.services.stats import compute_standings, compute_team_stats
+from app.models import PAResult, HalfInning
+
+def test_standings_follow_pas_and_finals(db, scaffold):
+    sc = scaffold(A=1, B=1, C=0)
+    s = sc.season
+    a, b, c = sc.teams.values()
+    (pa_,), (pb,), _ = sc.players.values()
+
+    def play(home, away, home_batter, away_batter, top, bottom):
+        g = models.Game(season_id=s.id, home_team_id=home.id, away_team_id=away.id)
+        db.add(g); db.flush()
+        for half, batter, results in ((HalfInning.top, away_batter, top), (HalfInning.bottom, home_batter, bottom)):
+            for r in results:
+                pa = models.PlateAppearance(game_id=g.id, inning=1, half=half, batter_id=batter.id,
+                                            result=r, rbis=1 if r == PAResult.HOMERUN else 0)
+                db.add(pa)
+                apply_pa(db, pa, g)
+        db.commit()
+        apply_game_result(db, g)
+        g.status = models.GameStatus.final
+        db.commit()
+        return g
+
+    # A beats B 2-1, then B beats A 3-0
+    g1 = play(a, b, pa_, pb, [PAResult.HOMERUN, PAResult.OUT], [PAResult.HOMERUN, PAResult.HOMERUN, PAResult.STRIKEOUT])
+    assert (g1.home_score, g1.away_score) == (2, 1)
+    play(b, a, pb, pa_, [PAResult.OUT], [PAResult.HOMERUN] * 3)
+    play(a, c, pa_, pa_, [], [PAResult.HOMERUN])
+
+    rows = {r.name: r for r in compute_standings(db, s.id)}
+    assert (rows["A"].wins, rows["A"].losses, rows["A"].run_diff) == (2, 1, -1)
+    assert (rows["B"].wins, rows["B"].losses, rows["B"].games_back) == (1, 1, 0.5)
+    assert (rows["C"].wins, rows["C"].losses, rows["C"].games_back) == (0, 1, 1.0)
+    assert [r.name for r in compute_standings(db, s.id)] == ["A", "B", "C"]
+
+    team_a = compute_team_stats(db, a)
+    assert team_a.batting.hr == 3 and team_a.batting.ab == 5
+    assert team_a.pitching.hr == 4 and team_a.pitching.ra == 4
+
+    # Reopening a game takes it back out of the records
+    apply_game_result(db, g1, sign=-1)
+    db.commit()
+    rows = {r.name: r for r in compute_standings(db, s.id)}
+    assert (rows["A"].wins, rows["B"].losses) == (1, 0)
+
+def test_pa_on_final_game_recounts_result(db, scaffold):
+    from app import schemas
+    from app.routers.games import set_status
+    from app.routers.plate_appearances import add_pa
+
+    sc = scaffold(H=1, A=1)
+    s, g = sc.season, sc.game
+    (ph,), (pa_,) = sc.players.values()
+
+    post = lambda half, batter, result, rbis: add_pa(schemas.PACreate(
+        game_id=g.id, inning=1, half=half, batter_id=batter.id, result=result, rbis=rbis), db)
+    post(HalfInning.bottom, ph, PAResult.HOMERUN, 1)
+    set_status(g.id, schemas.GameStatusUpdate(status=models.GameStatus.final), db)
+    # Late correction to the scoresheet: away scores three
+    post(HalfInning.top, pa_, PAResult.HOMERUN, 3)
+    rows = {r.name: r for r in compute_standings(db, s.id)}
+    assert (rows["A"].wins, rows["H"].losses, rows["H"].runs_against) == (1, 1, 3)
+
+    set_status(g.id, schemas.GameStatusUpdate(status=models.GameStatus.live), db)
+    rows = {r.name: r for r in compute_standings(db, s.id)}
+    assert all((r.wins, r.losses, r.runs_for, r.runs_against) == (0, 0, 0, 0) for r in rows.values())
@@ -42,3 +42,58 @@ def test_basic_stats(db):
     ada = next(b for b in box.batting if b.first_name == "Ada")
     assert ada.ab == 2 and ada.h == 1 and ada.bb == 1 and ada.sf == 1 and ada.tb == 1
     assert ada.avg == 0.5 and ada.obp == 0.5 and ada.slg == 0.5 and ada.ops == 1.0
+
+def test_advanced_metrics_and_league_constants(db, scaffold):
+    from app.services.stats import compute_season_stats, compute_season_pitching, compute_league_constants
+
+    sc = scaffold(A=["Ada Lovelace", "Grace Hopper", "Alan Turing"])
+    s, g = sc.season, sc.game
+    b1, b2, p = sc.players["A"]
+
+    def pa(batter, result, rbis=0):
+        return models.PlateAppearance(game_id=g.id, inning=1, half=HalfInning.top,
+                                      batter_id=batter.id, pitcher_id=p.id, result=result, rbis=rbis)
+    db.add_all([
+        pa(b1, PAResult.DOUBLE), pa(b1, PAResult.HOMERUN, 1), pa(b1, PAResult.STRIKEOUT), pa(b1, PAResult.WALK),
+        pa(b2, PAResult.OUT), pa(b2, PAResult.OUT), pa(b2, PAResult.SINGLE), pa(b2, PAResult.STRIKEOUT),
+    ])
+    db.commit()
+
+    lg = compute_league_constants(db, s.id)
+    # 8 PA: 3 H + 1 BB on base; 1+2+4 = 7 TB over 7 AB
+    assert lg.pa == 8 and lg.obp == 0.5 and lg.slg == 1.0
+    assert lg.k_pct == 0.25 and lg.bb_pct == 0.125
+    # 4 outs, 1 RA => ERA 6.75; FIP core = (13*1 + 3*1 - 2*2) / (4/3) = 9.0
+    assert lg.era == 6.75 and lg.fip_constant == -2.25
+
+    ada = next(x for x in compute_season_stats(db, s.id) if x.first_name == "Ada")
+    # AB 3, H 2, TB 6, PA 4
+    assert ada.iso == round(4 / 3, 3)
+    assert ada.babip == 1.0                    # (2-1) / (3-1-1+0)
+    assert ada.k_pct == 0.25 and ada.bb_pct == 0.25
+    assert ada.woba == round((0.69 + 1.27 + 2.10) / 4, 3)
+    assert ada.ops_plus == round(100 * (0.75 / 0.5 + 2.0 / 1.0 - 1))
+
+    turing = compute_season_pitching(db, s.id)[0]
+    # Only pitcher in the league, so FIP equals league ERA
+    assert turing.fip == 6.75 and turing.k_pct == 0.25
+
+def test_boxscore_cache_ignores_other_games(db, scaffold, monkeypatch):
+    from app import schemas
+    from app.routers import plate_appearances as pa_router
+    from app.services.cache import stats_cache
+
+    stats_cache.flush()
+    sc = scaffold(A=["Ada Lovelace"])
+    (ada,), g = sc.players["A"], sc.game
+    other = models.Game(season_id=sc.season.id, home_team_id=g.home_team_id, away_team_id=g.away_team_id)
+    db.add(other); db.commit()
+    post = lambda game: pa_router.add_pa(schemas.PACreate(
+        game_id=game.id, inning=1, half=HalfInning.top, batter_id=ada.id, result=PAResult.SINGLE), db)
+
+    post(g)
+    assert pa_router.get_boxscore(g.id, db).batting[0].h == 1
+    # Scoring another game of the season must not evict this one
+    post(other)
+    monkeypatch.setattr(pa_router, "compute_boxscore", lambda *a: pytest.fail("box score recomputed"))
+    assert pa_router.get_boxscore(g.id, db).batting[0].ops_plus is None